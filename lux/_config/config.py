@@ -5,6 +5,7 @@ For more resources, see https://github.com/pandas-dev/pandas/blob/master/pandas/
 from collections import namedtuple
 from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 import lux
+import os
 import warnings
 
 RegisteredOption = namedtuple("RegisteredOption", "name action display_condition args")
@@ -19,6 +20,8 @@ class Config:
         self._default_display = "pandas"
         self.plotting_style = None
         self.SQLconnection = ""
+        self.SQLdialect = None
+        self.SQLconnection_factory = None
         self.executor = None
         # holds registered option metadata
         self.actions: Dict[str, RegisteredOption] = {}
@@ -28,12 +31,21 @@ class Config:
         self._sampling_start = 10000
         self._sampling_cap = 30000
         self._sampling_flag = True
+        self._progressive_sampling = False
+        self._stratified_sampling = False
         self._heatmap_flag = True
         self._plotting_backend = "vegalite"
         self._topk = 15
         self._sort = "descending"
         self._pandas_fallback = True
         self._interestingness_fallback = True
+        self._unique_values_cap = 10000
+        self._metadata_cache_dir = None
+        self._metadata_cache_size = 256 * 2 ** 20
+        self._vis_cache_size = 64 * 2 ** 20
+        self._num_workers = 1
+        self._sql_batch_size = 50
+        self._sql_catalog_stats = False
 
     @property
     def topk(self):
@@ -123,6 +135,174 @@ class Config:
                 stacklevel=2,
             )
 
+    @property
+    def unique_values_cap(self):
+        return self._unique_values_cap
+
+    @unique_values_cap.setter
+    def unique_values_cap(self, cap: Optional[int]) -> None:
+        """
+        Setting the cardinality above which Lux stops storing every unique value of a column.
+        Columns with more unique values than the cap only keep their most frequent values,
+        while their cardinality is still computed exactly.
+
+        Parameters
+        ----------
+        cap : Optional[int]
+            None: always store every unique value
+            cap: maximum number of unique values to store for a column
+        """
+        if cap is None or (type(cap) == int and cap > 0):
+            self._unique_values_cap = cap
+        else:
+            warnings.warn(
+                "Parameter to lux.config.unique_values_cap must be a positive integer or None.",
+                stacklevel=2,
+            )
+
+    @property
+    def metadata_cache_dir(self):
+        return self._metadata_cache_dir
+
+    @metadata_cache_dir.setter
+    def metadata_cache_dir(self, path: Optional[str]) -> None:
+        """
+        Setting the directory where Lux persists the metadata computed for each column,
+        so that loading the same data again (e.g., in a new session) skips recomputing it.
+
+        Parameters
+        ----------
+        path : Optional[str]
+            None: do not cache metadata on disk (default)
+            path: directory in which the metadata cache is stored, created if it does not exist
+        """
+        if path is None:
+            self._metadata_cache_dir = None
+        elif isinstance(path, str) and path != "":
+            self._metadata_cache_dir = os.path.expanduser(path)
+        else:
+            warnings.warn(
+                "Parameter to lux.config.metadata_cache_dir must be a directory path or None.",
+                stacklevel=2,
+            )
+
+    @property
+    def metadata_cache_size(self):
+        return self._metadata_cache_size
+
+    @metadata_cache_size.setter
+    def metadata_cache_size(self, size: int) -> None:
+        """
+        Setting the maximum size of the metadata cache on disk. When the cache grows beyond this size,
+        the entries that were used least recently are removed.
+
+        Parameters
+        ----------
+        size : int
+            maximum size of the metadata cache in bytes
+        """
+        if type(size) == int and size > 0:
+            self._metadata_cache_size = size
+        else:
+            warnings.warn(
+                "Parameter to lux.config.metadata_cache_size must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def vis_cache_size(self):
+        return self._vis_cache_size
+
+    @vis_cache_size.setter
+    def vis_cache_size(self, size: int) -> None:
+        """
+        Setting the maximum size of the data of the visualizations that each dataframe keeps in memory,
+        so that visualizations generated again (e.g., by another action or display) are not recomputed.
+        Beyond this size, the visualizations that were used least recently are removed.
+
+        Parameters
+        ----------
+        size : int
+            maximum size of the data of the visualizations kept for a dataframe, in bytes
+        """
+        if type(size) == int and size > 0:
+            self._vis_cache_size = size
+        else:
+            warnings.warn(
+                "Parameter to lux.config.vis_cache_size must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def num_workers(self):
+        return self._num_workers
+
+    @num_workers.setter
+    def num_workers(self, n: int) -> None:
+        """
+        Setting the number of threads used to compute the metadata of the columns of a dataframe concurrently.
+
+        Parameters
+        ----------
+        n : int
+            1: compute the metadata of one column after another (default)
+            n: number of columns whose metadata is computed at the same time
+        """
+        if type(n) == int and n > 0:
+            self._num_workers = n
+        else:
+            warnings.warn(
+                "Parameter to lux.config.num_workers must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def sql_batch_size(self):
+        return self._sql_batch_size
+
+    @sql_batch_size.setter
+    def sql_batch_size(self, n: int) -> None:
+        """
+        Setting the number of visualizations whose data is queried together in a single SQL statement.
+
+        Parameters
+        ----------
+        n : int
+            1: send one query for each visualization
+            n: number of visualizations queried together (50 by default)
+        """
+        if type(n) == int and n > 0:
+            self._sql_batch_size = n
+        else:
+            warnings.warn(
+                "Parameter to lux.config.sql_batch_size must be a positive integer.",
+                stacklevel=2,
+            )
+
+    @property
+    def sql_catalog_stats(self):
+        return self._sql_catalog_stats
+
+    @sql_catalog_stats.setter
+    def sql_catalog_stats(self, flag: bool) -> None:
+        """
+        Setting whether the number of distinct values of the columns of a SQL table is estimated from the
+        statistics catalog of the database, instead of being counted by scanning the table.
+
+        Parameters
+        ----------
+        flag : bool
+            True: use the estimates of the catalog, except for columns whose estimate is close to a cutoff
+            False: count the distinct values of every column exactly (default)
+        """
+        if type(flag) == bool:
+            self._sql_catalog_stats = flag
+        else:
+            warnings.warn(
+                "The flag for SQL catalog statistics must be a boolean.",
+                stacklevel=2,
+            )
+
     @property
     def sampling_cap(self):
         """
@@ -205,6 +385,52 @@ class Config:
                 stacklevel=2,
             )
 
+    @property
+    def progressive_sampling(self):
+        return self._progressive_sampling
+
+    @progressive_sampling.setter
+    def progressive_sampling(self, flag: bool) -> None:
+        """
+        Setting whether recommendations are first computed on a small sample of a large dataframe,
+        then refined on larger samples up to the full data in a background thread.
+
+        Parameters
+        ----------
+        flag : bool
+            Whether or not the recommendations are refined progressively.
+        """
+        if type(flag) == bool:
+            self._progressive_sampling = flag
+        else:
+            warnings.warn(
+                "The flag for progressive sampling must be a boolean.",
+                stacklevel=2,
+            )
+
+    @property
+    def stratified_sampling(self):
+        return self._stratified_sampling
+
+    @stratified_sampling.setter
+    def stratified_sampling(self, flag: bool) -> None:
+        """
+        Setting whether the sample of a large dataframe keeps a minimum number of rows of every category
+        of its low-cardinality nominal attributes, instead of being uniformly random.
+
+        Parameters
+        ----------
+        flag : bool
+            Whether or not the sample is stratified over the categories of nominal attributes.
+        """
+        if type(flag) == bool:
+            self._stratified_sampling = flag
+        else:
+            warnings.warn(
+                "The flag for stratified sampling must be a boolean.",
+                stacklevel=2,
+            )
+
     @property
     def heatmap(self):
         """
@@ -334,29 +560,56 @@ class Config:
         del self.actions[name]
         self.update_actions["flag"] = True
 
-    def set_SQL_connection(self, connection):
+    def set_SQL_connection(self, connection, dialect=None):
         """
         Sets SQL connection to a database
 
         Parameters:
             connection : SQLAlchemy connectable, str, or sqlite3 connection
                 For more information, `see here <https://docs.sqlalchemy.org/en/13/core/connections.html>`__
+            dialect : str, optional
+                Database of the connection, "postgresql" or "sqlite", detected from the connection by default
         """
+        from lux.executor.SQLDialect import DIALECTS, get_dialect
+
         self.SQLconnection = connection
+        self.SQLconnection_factory = None
+        if dialect is not None:
+            if dialect not in DIALECTS:
+                raise ValueError(
+                    f"SQL dialect '{dialect}' is not supported, use one of {list(DIALECTS)}"
+                )
+            self.SQLdialect = DIALECTS[dialect]()
+        elif connection == "":
+            self.SQLdialect = None
+        else:
+            self.SQLdialect = get_dialect(connection)
+
+    def set_SQL_connection_factory(self, factory, dialect=None):
+        """
+        Sets a function creating new connections to a database, so that the SQL queries that do not depend on
+        each other are run concurrently on up to lux.config.num_workers connections
+
+        Parameters:
+            factory : Callable
+                Function returning a new connection, such as the connect method of a SQLAlchemy engine or
+                a function calling sqlite3.connect. The connections are closed once their query has run.
+            dialect : str, optional
+                Database of the connections, "postgresql" or "sqlite", detected from the connections by default
+        """
+        self.set_SQL_connection(factory(), dialect)
+        self.SQLconnection_factory = factory
 
     def set_executor_type(self, exe):
         if exe == "SQL":
-            import pkgutil
-
-            if pkgutil.find_loader("psycopg2") is None:
-                raise ImportError(
-                    "psycopg2 is not installed. Run `pip install psycopg2' to install psycopg2 to enable the Postgres connection."
-                )
-            else:
-                import psycopg2
+            # the database driver is the one of the connection given to set_SQL_connection
             from lux.executor.SQLExecutor import SQLExecutor
 
             self.executor = SQLExecutor()
+        elif exe == "Streaming":
+            from lux.executor.StreamingExecutor import StreamingExecutor
+
+            self.executor = StreamingExecutor()
         else:
             from lux.executor.PandasExecutor import PandasExecutor
 
@@ -58,8 +58,13 @@ def setOption(overridePandas=True):
             pd.io.spss.DataFrame
         ) = pd.io.stata.DataFrame = pd.io.api.DataFrame = pd.core.frame.DataFrame = LuxDataFrame
         pd.Series = pd.core.series.Series = LuxSeries
+        if hasattr(pd.io.parsers, "readers"):
+            # read_csv is defined in pandas.io.parsers.readers since pandas 1.3
+            pd.io.parsers.readers.DataFrame = LuxDataFrame
     else:
         pd.DataFrame = pd.io.parsers.DataFrame = pd.core.frame.DataFrame = originalDF
+        if hasattr(pd.io.parsers, "readers"):
+            pd.io.parsers.readers.DataFrame = originalDF
         pd.Series = originalSeries
 
 
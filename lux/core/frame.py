@@ -12,7 +12,9 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from collections import OrderedDict
 import pandas as pd
+from pandas.core.indexing import _iLocIndexer, _LocIndexer
 from lux.core.series import LuxSeries
 from lux.vis.Clause import Clause
 from lux.vis.Vis import Vis
@@ -25,8 +27,29 @@ from typing import Dict, Union, List, Callable
 # from lux.executor.Executor import *
 import warnings
 import traceback
+import threading
+import weakref
 import lux
 
+# held while recommendations are computed, so that a background refinement and a display do not interleave
+_recs_lock = threading.RLock()
+
+
+class _ExpiringIndexerMixin:
+    # Since pandas 1.4, the values set in place through loc and iloc are written to the blocks of the
+    # dataframe without going through the methods overridden by LuxDataFrame, so the data is expired here
+    def __setitem__(self, key, value):
+        super(_ExpiringIndexerMixin, self).__setitem__(key, value)
+        self.obj._expire_data()
+
+
+class _LuxLocIndexer(_ExpiringIndexerMixin, _LocIndexer):
+    pass
+
+
+class _LuxiLocIndexer(_ExpiringIndexerMixin, _iLocIndexer):
+    pass
+
 
 class LuxDataFrame(pd.DataFrame):
     """
@@ -42,6 +65,7 @@ class LuxDataFrame(pd.DataFrame):
         "cardinality",
         "_rec_info",
         "_min_max",
+        "_column_profile",
         "_current_vis",
         "_widget",
         "_recommendation",
@@ -49,12 +73,48 @@ class LuxDataFrame(pd.DataFrame):
         "_history",
         "_saved_export",
         "_sampled",
+        "_sample_weights",
         "_toggle_pandas_display",
         "_message",
         "_pandas_only",
         "pre_aggregated",
         "_type_override",
     ]
+    # Internal state that is specific to the data of this dataframe and is not propagated to derived frames
+    _internal_names_set = {
+        "_data_version",
+        "_dirty_columns",
+        "_metadata_source",
+        "_metadata_pending",
+        "_vis_results",
+        "_filter_bitmaps",
+        "_progressive_sample_size",
+        "_recs_generation",
+        "_refine_thread",
+        "_stream_source",
+        "_SQL_dtypes",
+        "_SQL_sample",
+    } | pd.DataFrame._internal_names_set
+    # Incremented on every modification of the data, so that the metadata and recommendations computed
+    # for an older version of the data are recomputed (class-level default for unpickled dataframes)
+    _data_version = 0
+    # Set on frames selected from the rows or columns of a dataframe, whose metadata can be derived from it
+    _metadata_source = None
+    # Columns whose metadata has not been requested yet for the current version of the data
+    _metadata_pending = frozenset()
+    # Data version and packed bitmaps of the filters applied to this dataframe, cached by the executor
+    _filter_bitmaps = None
+    # Number of rows of the sample that the recommendations are computed on, when refined progressively
+    _progressive_sample_size = None
+    # Incremented whenever the recommendations are recomputed, so that older background refinements stop
+    _recs_generation = 0
+    _refine_thread = None
+    # File that this dataframe is a sample of, with the statistics of its columns, when loaded with read_stream
+    _stream_source = None
+    # Types of the columns of the SQL table connected with set_SQL_table, as declared in the database
+    _SQL_dtypes = None
+    # Random sample of the rows of the SQL table that scatter plots are computed on, kept by the SQLExecutor
+    _SQL_sample = None
 
     def __init__(self, *args, **kw):
         from lux.executor.PandasExecutor import PandasExecutor
@@ -70,9 +130,12 @@ class LuxDataFrame(pd.DataFrame):
         super(LuxDataFrame, self).__init__(*args, **kw)
 
         self.table_name = ""
-        lux.config.executor = PandasExecutor()
+        # the SQL and Streaming executors are kept, as they process other dataframes like the PandasExecutor
+        if not isinstance(lux.config.executor, PandasExecutor):
+            lux.config.executor = PandasExecutor()
 
         self._sampled = None
+        self._sample_weights = None
         self._toggle_pandas_display = True
         self._message = Message()
         self._pandas_only = False
@@ -81,8 +144,11 @@ class LuxDataFrame(pd.DataFrame):
         self.unique_values = None
         self.cardinality = None
         self._min_max = None
+        self._column_profile = None
         self.pre_aggregated = None
         self._type_override = {}
+        self._dirty_columns = set()
+        self._vis_results = OrderedDict()
         warnings.formatwarning = lux.warning_format
 
     @property
@@ -105,19 +171,253 @@ class LuxDataFrame(pd.DataFrame):
 
     @property
     def data_type(self):
-        if not self._data_type:
+        if not self._data_type or self._metadata_pending:
             self.maintain_metadata()
         return self._data_type
 
-    def maintain_metadata(self):
-        # Check that metadata has not yet been computed
-        if not hasattr(self, "_metadata_fresh") or not self._metadata_fresh:
+    def maintain_metadata(self, columns=None):
+        """
+        Computes the metadata of the dataframe, unless it is up to date with the data.
+
+        Parameters
+        ----------
+        columns : list, optional
+            Columns whose metadata is needed, by default all of them. The metadata of a column
+            is only computed the first time that it is requested, and then kept until the column changes.
+        """
+        from lux.executor.PandasExecutor import PandasExecutor
+
+        copied = False
+        # Check that metadata has not yet been computed for the current version of the data
+        if (
+            not hasattr(self, "_metadata_fresh")
+            or not self._metadata_fresh
+            or self._metadata_version != self._data_version
+        ):
+            self._metadata_pending = frozenset()
+            copied = True
             # only compute metadata information if the dataframe is non-empty
             if len(self) > 0:
-                lux.config.executor.compute_stats(self)
-                lux.config.executor.compute_dataset_metadata(self)
+                derived_axis = self._derived_metadata_axis()
+                if derived_axis == 1:
+                    # the selected columns have the same values as in the parent frame
+                    self._project_metadata()
+                elif derived_axis == 0:
+                    # the rows are selected from the parent frame, so the data types of the parent are kept
+                    lux.config.executor.compute_stats(self)
+                    self._data_type = self._project_metadata_dict(self._data_type, raw_labels=True)
+                elif (
+                    isinstance(lux.config.executor, PandasExecutor)
+                    and self._stream_source is None
+                    and not self.table_name
+                ):
+                    # the metadata of each column is computed once it is requested, below
+                    # (the dataframes streamed from a file or connected to a SQL table are profiled at once)
+                    self.unique_values = {}
+                    self.cardinality = {}
+                    self._min_max = {}
+                    self._column_profile = {}
+                    self._data_type = {}
+                    self._metadata_pending = frozenset(self.columns)
+                    # the metadata of timestamp columns is keyed by their repr, so it is computed right away
+                    timestamp_columns = [
+                        attr
+                        for attr in self.columns
+                        if isinstance(attr, pd._libs.tslibs.timestamps.Timestamp)
+                    ]
+                    if timestamp_columns:
+                        self._compute_column_metadata(timestamp_columns)
+                else:
+                    lux.config.executor.compute_stats(self)
+                    lux.config.executor.compute_dataset_metadata(self)
                 self._infer_structure()
                 self._metadata_fresh = True
+                self._metadata_version = self._data_version
+                self._metadata_source = None
+                self._dirty_columns = set()
+        elif self._dirty_columns:
+            # only the columns modified since the metadata was computed need to be recomputed
+            self._copy_metadata()
+            copied = True
+            dirty_columns = self._dirty_columns
+            self._dirty_columns = set()
+            self._metadata_pending = self._metadata_pending.difference(dirty_columns)
+            modified_columns = [attr for attr in self.columns if attr in dirty_columns]
+            lux.config.executor.compute_stats(self, modified_columns)
+            lux.config.executor.compute_data_type(self, modified_columns)
+            for attr in dirty_columns:
+                if attr not in self.columns:
+                    self._remove_column_metadata(attr)
+            self._infer_structure()
+        if self._metadata_pending:
+            if columns is None:
+                requested = self._metadata_pending
+            else:
+                requested = self._metadata_pending.intersection(columns)
+            if requested:
+                if not copied:
+                    self._copy_metadata()
+                self._compute_column_metadata([attr for attr in self.columns if attr in requested])
+
+    def _copy_metadata(self):
+        # frames derived from this dataframe may hold the same metadata dictionaries, and keep the metadata
+        # that they were created with, so the dictionaries are copied before the metadata of some columns
+        # is updated (once per call to maintain_metadata, however many columns are updated)
+        self.unique_values = dict(self.unique_values)
+        self.cardinality = dict(self.cardinality)
+        self._min_max = dict(self._min_max)
+        self._column_profile = dict(self._column_profile)
+        self._data_type = dict(self._data_type)
+
+    def _compute_column_metadata(self, columns):
+        """
+        Computes the metadata of the given columns, reading it from the on-disk cache when it is enabled.
+        """
+        self._metadata_pending = self._metadata_pending.difference(columns)
+        if lux.config.metadata_cache_dir is not None:
+            self._compute_cached_metadata(columns)
+        else:
+            lux.config.executor.compute_stats(self, columns)
+            lux.config.executor.compute_data_type(self, columns)
+        if not self._metadata_pending and len(columns) < len(self.columns):
+            # once every column has been requested, order the metadata as if it had been computed at once
+            labels = list(self.columns)
+            stats_labels = [
+                str(attr._date_repr) if isinstance(attr, pd._libs.tslibs.timestamps.Timestamp) else attr
+                for attr in labels
+            ]
+            for name, keys in [
+                ("unique_values", stats_labels),
+                ("cardinality", stats_labels),
+                ("_min_max", stats_labels),
+                ("_column_profile", stats_labels),
+                ("_data_type", labels),
+            ]:
+                metadata = getattr(self, name)
+                ordered = {key: metadata[key] for key in keys if key in metadata}
+                ordered.update(metadata)
+                setattr(self, name, ordered)
+
+    def _compute_cached_metadata(self, columns):
+        """
+        Computes the metadata of the given columns, reading the statistics and data type of each column
+        from the on-disk cache in lux.config.metadata_cache_dir when the column has been seen before.
+        Only the columns missing from the cache are computed, and then stored in the cache.
+        """
+        from lux.utils import metadata_cache
+
+        cache_dir = lux.config.metadata_cache_dir
+        fingerprints = {}
+        cached_columns = []
+        for attr in columns:
+            if isinstance(attr, pd._libs.tslibs.timestamps.Timestamp):
+                # the metadata of timestamp columns is keyed by their repr, so they are not cached
+                continue
+            fingerprint = metadata_cache.column_fingerprint(self[attr])
+            if fingerprint is None:
+                continue
+            entry = metadata_cache.load(cache_dir, fingerprint)
+            if entry is None:
+                fingerprints[attr] = fingerprint
+                continue
+            self.unique_values[attr] = entry["unique_values"]
+            self.cardinality[attr] = entry["cardinality"]
+            if entry["min_max"] is not None:
+                self._min_max[attr] = entry["min_max"]
+            self._column_profile[attr] = entry["column_profile"]
+            self._data_type[attr] = self._type_override.get(attr, entry["data_type"])
+            cached_columns.append(attr)
+
+        cached = set(cached_columns)
+        columns = [attr for attr in columns if attr not in cached]
+        lux.config.executor.compute_stats(self, columns)
+        lux.config.executor.compute_data_type(self, columns)
+        lux.config.executor.warn_temporal_attributes(self, cached_columns)
+
+        # data types set by the user are not inferred from the column, so they are not cached
+        entries = {
+            fingerprint: {
+                "unique_values": self.unique_values[attr],
+                "cardinality": self.cardinality[attr],
+                "min_max": self._min_max.get(attr),
+                "column_profile": self._column_profile[attr],
+                "data_type": self._data_type[attr],
+            }
+            for attr, fingerprint in fingerprints.items()
+            if attr not in self._type_override
+        }
+        metadata_cache.store(cache_dir, entries, lux.config.metadata_cache_size)
+
+    def _metadata_up_to_date(self):
+        return (
+            getattr(self, "_metadata_fresh", False)
+            and self._metadata_version == self._data_version
+            and not self._dirty_columns
+            and not self._metadata_pending
+        )
+
+    def _derive_metadata(self, child, axis, view=False):
+        """
+        Record that the metadata of a child frame, made of a subset of the rows or the columns of this
+        dataframe, can be derived from the metadata of this dataframe instead of being recomputed.
+
+        Parameters
+        ----------
+        child : LuxDataFrame
+            Result of the row or column selection, which already holds the metadata of this dataframe
+        axis : int or str
+            Axis along which the rows or columns are selected
+        view : bool
+            Whether the child may be a view on the data of this dataframe, in which case the metadata
+            is only derived as long as this dataframe has not been modified
+        """
+        if not isinstance(child, LuxDataFrame):
+            return
+        axis = self._get_axis_number(axis)
+        if self._metadata_up_to_date():
+            child._metadata_source = (axis, weakref.ref(self) if view else None, self._data_version)
+        elif not view and self._metadata_source is not None and self._metadata_source[1] is None:
+            # this dataframe is itself a selection whose metadata is still the one of its parent,
+            # so that the rows of the child are a subset of the parent rows if any of the selections is on rows
+            child._metadata_source = (min(axis, self._metadata_source[0]), None, None)
+
+    def _derived_metadata_axis(self):
+        if self._metadata_source is None or self._data_type is None:
+            return None
+        axis, parent_ref, version = self._metadata_source
+        if parent_ref is not None:
+            parent = parent_ref()
+            if parent is None or parent._data_version != version:
+                return None
+        if not all(attr in self._data_type for attr in self.columns):
+            return None
+        return axis
+
+    def _project_metadata(self):
+        self.unique_values = self._project_metadata_dict(self.unique_values)
+        self.cardinality = self._project_metadata_dict(self.cardinality)
+        self._min_max = self._project_metadata_dict(self._min_max)
+        self._column_profile = self._project_metadata_dict(self._column_profile)
+        self._data_type = self._project_metadata_dict(self._data_type, raw_labels=True)
+
+    def _project_metadata_dict(self, metadata, raw_labels=False):
+        # keep the entries of the columns of this dataframe (and of its index) from the parent metadata
+        attributes = {self.index.name}
+        for attr in self.columns:
+            if not raw_labels and isinstance(attr, pd._libs.tslibs.timestamps.Timestamp):
+                attributes.add(str(attr._date_repr))
+            else:
+                attributes.add(attr)
+        return {attr: val for attr, val in metadata.items() if attr in attributes}
+
+    def _remove_column_metadata(self, attr):
+        if isinstance(attr, pd._libs.tslibs.timestamps.Timestamp):
+            attribute_repr = str(attr._date_repr)
+        else:
+            attribute_repr = attr
+        for metadata in [self.unique_values, self.cardinality, self._min_max, self._column_profile]:
+            metadata.pop(attribute_repr, None)
+        self._data_type.pop(attr, None)
 
     def expire_recs(self):
         """
@@ -130,6 +430,88 @@ class LuxDataFrame(pd.DataFrame):
         self._rec_info = None
         self._sampled = None
 
+    def _expire_columns(self, columns):
+        """
+        Expire the metadata and recommendations that depend on the given columns.
+        The metadata of the other columns is kept, along with the data and scores of the
+        visualizations that do not involve the given columns, so that they are not recomputed.
+
+        Parameters
+        ----------
+        columns : list
+            Columns that have been added, modified, renamed or removed
+        """
+        self._data_version += 1
+        if (
+            not getattr(self, "_metadata_fresh", False)
+            or self._metadata_version != self._data_version - 1
+            or self._stream_source is not None
+        ):
+            # the modified data is no longer a sample of the file that it was loaded from
+            self._stream_source = None
+            self.expire_metadata()
+            self.expire_recs()
+            return
+        # the metadata of the columns that are not dirty is up to date with the new version
+        self._metadata_version = self._data_version
+        columns = set(columns)
+        self._dirty_columns = self._dirty_columns | columns
+        self._vis_results = OrderedDict(
+            (key, result)
+            for key, result in self._vis_results.items()
+            if not columns.intersection(result["attributes"])
+        )
+        self.expire_recs()
+
+    def _get_vis_result(self, vis):
+        """
+        Retrieve the data and score previously computed for a vis with the same intent on this dataframe.
+        """
+        results = getattr(self, "_vis_results", None)
+        if not results:
+            return None
+        key = lux.utils.utils.get_vis_key(vis)
+        result = results.get(key)
+        if result is None or result["sample_size"] != self._sample_size():
+            return None
+        results.move_to_end(key)
+        return result
+
+    def _save_vis_result(self, vis, **result):
+        if getattr(self, "_vis_results", None) is None:
+            return
+        key = lux.utils.utils.get_vis_key(vis)
+        sample_size = self._sample_size()
+        if key not in self._vis_results or self._vis_results[key]["sample_size"] != sample_size:
+            self._vis_results[key] = {
+                "attributes": lux.utils.utils.get_vis_attributes(vis),
+                "sample_size": sample_size,
+                "nbytes": 0,
+            }
+        self._vis_results[key].update(result)
+        if "data" in result:
+            self._vis_results[key]["nbytes"] = int(result["data"].memory_usage(index=True).sum())
+        self._vis_results.move_to_end(key)
+        # evict the results that were used least recently once they exceed the size of the cache
+        size = sum(cached["nbytes"] for cached in self._vis_results.values())
+        while size > lux.config.vis_cache_size and len(self._vis_results) > 1:
+            _, evicted = self._vis_results.popitem(last=False)
+            size -= evicted["nbytes"]
+
+    def _sample_size(self):
+        if self._sampled is None:
+            return None
+        return len(self._sampled)
+
+    def _expire_data(self):
+        """
+        Expire the metadata and recommendations after a modification that may affect any column.
+        """
+        self._data_version += 1
+        self._stream_source = None
+        self.expire_metadata()
+        self.expire_recs()
+
     def expire_metadata(self):
         """
         Expire all saved metadata to trigger a recomputation the next time the data is required.
@@ -139,31 +521,90 @@ class LuxDataFrame(pd.DataFrame):
         self.unique_values = None
         self.cardinality = None
         self._min_max = None
+        self._column_profile = None
         self.pre_aggregated = None
+        self._dirty_columns = set()
+        self._metadata_source = None
+        self._metadata_pending = frozenset()
+        self._vis_results = OrderedDict()
 
     #####################
     ## Override Pandas ##
     #####################
-    def __getattr__(self, name):
-        ret_value = super(LuxDataFrame, self).__getattr__(name)
-        self.expire_metadata()
-        self.expire_recs()
-        return ret_value
-
     def _set_axis(self, axis, labels):
+        previous_columns = self.columns
         super(LuxDataFrame, self)._set_axis(axis, labels)
-        self.expire_metadata()
-        self.expire_recs()
+        # axis 0 of the block manager holds the columns
+        if axis == 0 and previous_columns.is_unique and self.columns.is_unique:
+            # relabeling the columns does not modify their values, so only the renamed columns are expired
+            renamed = [
+                (prev, curr) for prev, curr in zip(previous_columns, self.columns) if prev != curr
+            ]
+            self._expire_columns([attr for pair in renamed for attr in pair])
+        else:
+            self._expire_data()
 
     def _update_inplace(self, *args, **kwargs):
         super(LuxDataFrame, self)._update_inplace(*args, **kwargs)
-        self.expire_metadata()
-        self.expire_recs()
+        self._expire_data()
 
     def _set_item(self, key, value):
         super(LuxDataFrame, self)._set_item(key, value)
-        self.expire_metadata()
-        self.expire_recs()
+        self._expire_columns([key])
+
+    def __delitem__(self, key):
+        previous_columns = self.columns
+        super(LuxDataFrame, self).__delitem__(key)
+        self._expire_columns([attr for attr in previous_columns if attr not in self.columns])
+
+    def insert(self, loc, column, value, *args, **kwargs):
+        super(LuxDataFrame, self).insert(loc, column, value, *args, **kwargs)
+        self._expire_columns([column])
+
+    def _iset_item(self, loc, value, *args, **kwargs):
+        # values of a single column have been set through an indexer (e.g., loc, iloc)
+        super(LuxDataFrame, self)._iset_item(loc, value, *args, **kwargs)
+        self._expire_columns([self.columns[loc]])
+
+    def _set_value(self, index, col, value, takeable=False):
+        # a single value has been set through `at` or `iat`
+        super(LuxDataFrame, self)._set_value(index, col, value, takeable=takeable)
+        self._expire_columns([self.columns[col] if takeable else col])
+
+    @property
+    def loc(self):
+        return _LuxLocIndexer("loc", self)
+
+    @property
+    def iloc(self):
+        return _LuxiLocIndexer("iloc", self)
+
+    def take(self, indices, axis=0, *args, **kwargs):
+        result = super(LuxDataFrame, self).take(indices, axis, *args, **kwargs)
+        self._derive_metadata(result, axis)
+        return result
+
+    def _take_with_is_copy(self, indices, axis=0):
+        # boolean masks and lists of columns are selected without calling take since pandas 1.5
+        result = super(LuxDataFrame, self)._take_with_is_copy(indices, axis)
+        self._derive_metadata(result, axis)
+        return result
+
+    def _slice(self, slobj, axis=0):
+        result = super(LuxDataFrame, self)._slice(slobj, axis)
+        self._derive_metadata(result, axis, view=True)
+        return result
+
+    def _maybe_cache_changed(self, item, value, *args, **kwargs):
+        # a column retrieved from the dataframe has been modified in place
+        super(LuxDataFrame, self)._maybe_cache_changed(item, value, *args, **kwargs)
+        self._expire_columns([item])
+
+    def _maybe_update_cacher(self, clear=False, **kwargs):
+        super(LuxDataFrame, self)._maybe_update_cacher(clear=clear, **kwargs)
+        if clear:
+            # values have been set through an indexer (e.g., loc, iloc, at)
+            self._expire_data()
 
     def _infer_structure(self):
         # If the dataframe is very small and the index column is not a range index, then it is likely that this is an aggregated data
@@ -218,13 +659,12 @@ class LuxDataFrame(pd.DataFrame):
         self._parse_validate_compile_intent()
 
     def _parse_validate_compile_intent(self):
-        self.maintain_metadata()
         from lux.processor.Parser import Parser
         from lux.processor.Validator import Validator
 
+        # the validator and compiler compute the metadata of the columns used by the intent
         self._intent = Parser.parse(self._intent)
         Validator.validate_intent(self._intent, self)
-        self.maintain_metadata()
         from lux.processor.Compiler import Compiler
 
         self.current_vis = Compiler.compile_intent(self, self._intent)
@@ -274,6 +714,8 @@ class LuxDataFrame(pd.DataFrame):
 
         if not self.data_type:
             self.maintain_metadata()
+        # the dictionary of data types is shared with the frames derived from this dataframe
+        self._data_type = dict(self._data_type)
 
         for attr in types:
             if types[attr] not in ["nominal", "quantitative", "id", "temporal"]:
@@ -282,6 +724,7 @@ class LuxDataFrame(pd.DataFrame):
                 )
             self.data_type[attr] = types[attr]
 
+        self._vis_results = OrderedDict()
         self.expire_recs()
 
     def to_pandas(self):
@@ -329,101 +772,134 @@ class LuxDataFrame(pd.DataFrame):
 
     def set_SQL_table(self, t_name):
         self.table_name = t_name
+        self._SQL_sample = None
         self.compute_SQL_dataset_metadata()
 
     def compute_SQL_dataset_metadata(self):
         self.get_SQL_attributes()
-        for attr in list(self.columns):
-            self[attr] = None
         self._data_type = {}
         #####NOTE: since we aren't expecting users to do much data processing with the SQL database, should we just keep this
         #####      in the initialization and do it just once
-        self.compute_SQL_data_type()
         self.compute_SQL_stats()
+        self.compute_SQL_data_type()
 
     def compute_SQL_stats(self):
         # precompute statistics
         self.unique_values = {}
         self._min_max = {}
+        self._column_profile = {}
 
+        self.get_SQL_cardinality()
         self.get_SQL_unique_values()
-        # self.get_SQL_cardinality()
-        for attribute in self.columns:
-            if self._data_type[attribute] == "quantitative":
-                self._min_max[attribute] = (
-                    self[attribute].min(),
-                    self[attribute].max(),
-                )
 
     def get_SQL_attributes(self):
-        if "." in self.table_name:
-            table_name = self.table_name[self.table_name.index(".") + 1 :]
-        else:
-            table_name = self.table_name
-        query = f"SELECT column_name FROM INFORMATION_SCHEMA.COLUMNS where TABLE_NAME = '{table_name}'"
-        attributes = list(pd.read_sql(query, lux.config.SQLconnection)["column_name"])
-        for attr in attributes:
+        self._SQL_dtypes = lux.config.SQLdialect.get_column_types(
+            self.table_name, lux.config.SQLconnection
+        )
+        for attr in self._SQL_dtypes:
             self[attr] = None
 
     def get_SQL_cardinality(self):
+        """
+        Computes the number of distinct values of every column, and the min/max of the numeric columns,
+        with a single query.
+
+        With lux.config.sql_catalog_stats, the number of distinct values estimated by the statistics catalog
+        of the database is used instead, unless the estimate is close to a cutoff that it would decide: the
+        cardinality below which numeric columns are nominal, and lux.config.unique_values_cap.
+        """
+        # numeric columns with fewer distinct values are nominal, as in compute_SQL_data_type
+        NOMINAL_CUTOFF = 13
+        # estimates within this fraction of a cutoff are counted exactly
+        ESTIMATE_MARGIN = 0.5
+        dialect = lux.config.SQLdialect
+        columns = list(self.columns)
+        if not columns:
+            self.cardinality = {}
+            self._min_max = {}
+            return
+        estimates = {}
+        if lux.config.sql_catalog_stats:
+            estimates = dialect.get_cardinality_estimates(self.table_name, lux.config.SQLconnection)
+        cutoffs = [NOMINAL_CUTOFF]
+        if lux.config.unique_values_cap is not None:
+            cutoffs.append(lux.config.unique_values_cap)
         cardinality = {}
-        for attr in list(self.columns):
-            card_query = pd.read_sql(
-                f"SELECT Count(Distinct({attr})) FROM {self.table_name}",
-                lux.config.SQLconnection,
+        selections = []
+        for i, attr in enumerate(columns):
+            estimate = estimates.get(attr)
+            if estimate is not None and all(
+                abs(estimate - cutoff) > ESTIMATE_MARGIN * cutoff for cutoff in cutoffs
+            ):
+                cardinality[attr] = int(round(estimate))
+            else:
+                selections.append(f"COUNT(DISTINCT {dialect.quote(attr)}) AS cardinality_{i}")
+            if dialect.get_type_category(self._SQL_dtypes[attr]) == "numeric":
+                selections.append(f"MIN({dialect.quote(attr)}) AS min_{i}")
+                selections.append(f"MAX({dialect.quote(attr)}) AS max_{i}")
+        stats = {}
+        if selections:
+            stats = pd.read_sql(
+                f"SELECT {', '.join(selections)} FROM {self.table_name}", lux.config.SQLconnection
             )
-            cardinality[attr] = list(card_query["count"])[0]
+            stats = dict(zip(stats.columns, stats.values.tolist()[0]))
+        min_max = {}
+        for i, attr in enumerate(columns):
+            if attr not in cardinality:
+                cardinality[attr] = int(stats[f"cardinality_{i}"])
+            # the min/max of columns without any value are NULL
+            attr_min = stats.get(f"min_{i}")
+            if attr_min is not None and not lux.utils.utils.like_nan(attr_min):
+                min_max[attr] = (attr_min, stats[f"max_{i}"])
         self.cardinality = cardinality
+        self._min_max = min_max
 
     def get_SQL_unique_values(self):
+        """
+        Retrieves the distinct values of every column. Only the first 100 distinct values of the columns with
+        more than lux.config.unique_values_cap distinct values are retrieved, as for the columns of a dataframe.
+        """
+        from lux.executor.SQLExecutor import SQLExecutor
+
+        TOPK_VALUES = 100
+        quote = lux.config.SQLdialect.quote
+        cap = lux.config.unique_values_cap
+        columns = list(self.columns)
+        queries = []
+        column_profile = {}
+        for attr in columns:
+            truncated = cap is not None and self.cardinality[attr] > cap
+            limit = f" LIMIT {TOPK_VALUES}" if truncated else ""
+            queries.append(f"SELECT DISTINCT {quote(attr)} FROM {self.table_name}{limit}")
+            column_profile[attr] = {"truncated": truncated}
+        # the distinct values of the columns are retrieved concurrently when a connection factory is set
         unique_vals = {}
-        for attr in list(self.columns):
-            unique_query = pd.read_sql(
-                f"SELECT Distinct({attr}) FROM {self.table_name}",
-                lux.config.SQLconnection,
-            )
+        for attr, unique_query in zip(columns, SQLExecutor.map_queries(queries)):
             unique_vals[attr] = list(unique_query[attr])
+            # the distinct values of the columns that are retrieved entirely also count them exactly
+            if not column_profile[attr]["truncated"]:
+                self.cardinality[attr] = int(unique_query[attr].nunique())
         self.unique_values = unique_vals
+        self._column_profile = column_profile
 
     def compute_SQL_data_type(self):
         data_type = {}
-        sql_dtypes = {}
-        self.get_SQL_cardinality()
-        if "." in self.table_name:
-            table_name = self.table_name[self.table_name.index(".") + 1 :]
-        else:
-            table_name = self.table_name
-        # get the data types of the attributes in the SQL table
-        for attr in list(self.columns):
-            query = f"SELECT DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_NAME = '{table_name}' AND COLUMN_NAME = '{attr}'"
-            datatype = list(pd.read_sql(query, lux.config.SQLconnection)["data_type"])[0]
-            sql_dtypes[attr] = datatype
-
+        # the data types of the attributes in the SQL table are retrieved along with their names
+        sql_dtypes = self._SQL_dtypes
         for attr in list(self.columns):
+            category = lux.config.SQLdialect.get_type_category(sql_dtypes[attr])
             if attr in self._type_override:
                 data_type[attr] = self._type_override[attr]
             elif str(attr).lower() in ["month", "year"]:
                 data_type[attr] = "temporal"
-            elif sql_dtypes[attr] in [
-                "character",
-                "character varying",
-                "boolean",
-                "uuid",
-                "text",
-            ]:
+            elif category == "nominal":
                 data_type[attr] = "nominal"
-            elif sql_dtypes[attr] in [
-                "integer",
-                "real",
-                "smallint",
-                "smallserial",
-                "serial",
-            ]:
+            elif category == "numeric":
                 if self.cardinality[attr] < 13:
                     data_type[attr] = "nominal"
                 else:
                     data_type[attr] = "quantitative"
-            elif "time" in sql_dtypes[attr] or "date" in sql_dtypes[attr]:
+            elif category == "temporal":
                 data_type[attr] = "temporal"
         self._data_type = data_type
 
@@ -459,40 +935,103 @@ class LuxDataFrame(pd.DataFrame):
             rec_df._message.add(f"{id_fields_str} is not visualized since it resembles an ID field.")
         rec_df._prev = None  # reset _prev
 
-        # Check that recs has not yet been computed
-        if not hasattr(rec_df, "_recs_fresh") or not rec_df._recs_fresh:
-            rec_infolist = []
-            from lux.action.row_group import row_group
-            from lux.action.column_group import column_group
-
-            # TODO: Rewrite these as register action inside default actions
-            if rec_df.pre_aggregated:
-                if rec_df.columns.name is not None:
-                    rec_df._append_rec(rec_infolist, row_group(rec_df))
-                rec_df._append_rec(rec_infolist, column_group(rec_df))
-            else:
-                # if rec_df._recommendation == {}:
-                from lux.action.custom import custom_actions
-
-                # generate vis from globally registered actions and append to dataframe
-                custom_action_collection = custom_actions(rec_df)
-                for rec in custom_action_collection:
-                    rec_df._append_rec(rec_infolist, rec)
-                lux.config.update_actions["flag"] = False
-
-            # Store _rec_info into a more user-friendly dictionary form
-            rec_df._recommendation = {}
-            for rec_info in rec_infolist:
-                action_type = rec_info["action"]
-                vlist = rec_info["collection"]
-                if len(vlist) > 0:
-                    rec_df._recommendation[action_type] = vlist
-            rec_df._rec_info = rec_infolist
-            self._widget = rec_df.render_widget()
+        # Check that recs has not yet been computed for the current version of the data
+        if (
+            not hasattr(rec_df, "_recs_fresh")
+            or not rec_df._recs_fresh
+            or rec_df._recs_version != rec_df._data_version
+        ):
+            sample_sizes = []
+            if lux.config.progressive_sampling and not rec_df.pre_aggregated:
+                sample_sizes = lux.config.executor.get_progressive_sample_sizes(rec_df)
+            with _recs_lock:
+                rec_df._recs_generation += 1
+                rec_df._set_progressive_sample_size(sample_sizes[0] if sample_sizes else None)
+                rec_df._compute_recs()
+                self._widget = rec_df.render_widget()
+            if len(sample_sizes) > 1:
+                rec_df._refine_recs(self._widget, sample_sizes[1:])
         # re-render widget for the current dataframe if previous rec is not recomputed
         elif show_prev:
             self._widget = rec_df.render_widget()
         self._recs_fresh = True
+        self._recs_version = self._data_version
+
+    def _compute_recs(self):
+        rec_infolist = []
+        from lux.action.row_group import row_group
+        from lux.action.column_group import column_group
+
+        # TODO: Rewrite these as register action inside default actions
+        if self.pre_aggregated:
+            if self.columns.name is not None:
+                self._append_rec(rec_infolist, row_group(self))
+            self._append_rec(rec_infolist, column_group(self))
+        else:
+            # if self._recommendation == {}:
+            from lux.action.custom import custom_actions
+
+            # generate vis from globally registered actions and append to dataframe
+            custom_action_collection = custom_actions(self)
+            for rec in custom_action_collection:
+                self._append_rec(rec_infolist, rec)
+            lux.config.update_actions["flag"] = False
+
+        # Store _rec_info into a more user-friendly dictionary form
+        recommendation = {}
+        sample_size = len(self) if self._sampled is None else len(self._sampled)
+        for rec_info in rec_infolist:
+            # number of rows the recommendations were computed on, smaller than the dataframe if sampled
+            rec_info["sample_size"] = sample_size
+            action_type = rec_info["action"]
+            vlist = rec_info["collection"]
+            if len(vlist) > 0:
+                recommendation[action_type] = vlist
+        self._recommendation = recommendation
+        self._rec_info = rec_infolist
+
+    def _set_progressive_sample_size(self, sample_size):
+        if sample_size != self._progressive_sample_size:
+            self._progressive_sample_size = sample_size
+            self._sampled = None
+
+    def _refine_recs(self, widget, sample_sizes):
+        """
+        Recompute the recommendations on each of the given sample sizes in a background thread,
+        updating the widget in place after each of them. The refinement stops as soon as the data is
+        modified or the recommendations are recomputed for another reason (e.g., a new intent).
+
+        Parameters
+        ----------
+        widget : luxwidget.LuxWidget
+            Widget displaying the recommendations of this dataframe
+        sample_sizes : list[int]
+            Increasing numbers of rows of the samples to refine the recommendations on
+        """
+        generation = self._recs_generation
+        version = self._data_version
+
+        def is_current():
+            return self._recs_generation == generation and self._data_version == version
+
+        def refine():
+            for sample_size in sample_sizes:
+                with _recs_lock:
+                    if not is_current():
+                        return
+                    # the sampling message of the previous sample is replaced by that of the new sample
+                    self._message.remove(99)
+                    self._set_progressive_sample_size(sample_size)
+                    self._compute_recs()
+                    widget_json = self.to_JSON(self._rec_info)
+                    if not is_current():
+                        return
+                widget.currentVis = widget_json["current_vis"]
+                widget.recommendations = widget_json["recommendation"]
+                widget.message = self._message.to_html()
+
+        self._refine_thread = threading.Thread(target=refine, daemon=True)
+        self._refine_thread.start()
 
     #######################################################
     ############## LuxWidget Result Display ###############
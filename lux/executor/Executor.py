@@ -43,6 +43,11 @@ class Executor:
     def execute_filter(vis, ldf):
         return NotImplemented
 
+    @staticmethod
+    def get_progressive_sample_sizes(ldf):
+        # executors that do not sample the data compute the recommendations once on the full data
+        return []
+
     @staticmethod
     def compute_stats(self):
         return NotImplemented
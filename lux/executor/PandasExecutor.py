@@ -12,6 +12,7 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+from collections import OrderedDict
 import pandas as pd
 from lux.vis.VisList import VisList
 from lux.vis.Vis import Vis
@@ -23,6 +24,19 @@ from lux.utils.utils import check_import_lux_widget, check_if_id_like
 import warnings
 import lux
 
+# number of values binned at once by execute_block_binning
+BINNING_BLOCK_SIZE = 2 ** 16
+# number of rows of the first sample of a dataframe when the recommendations are refined progressively,
+# and growth factor of the size of the next samples
+PROGRESSIVE_SAMPLE_START = 1000
+PROGRESSIVE_SAMPLE_GROWTH = 10
+# minimum number of rows kept for each category of the nominal attributes by execute_stratified_sampling,
+# and maximum cardinality of the attributes that the sample is stratified over
+STRATIFIED_SAMPLE_MIN_ROWS = 30
+STRATIFIED_SAMPLE_MAX_CARDINALITY = 30
+# maximum number of bytes of the filter bitmaps kept for each dataframe by get_filter_bitmap
+FILTER_CACHE_SIZE = 16 * 2 ** 20
+
 
 class PandasExecutor(Executor):
     """
@@ -44,22 +58,142 @@ class PandasExecutor(Executor):
         SAMPLE_CAP = lux.config.sampling_cap
         SAMPLE_FRAC = 0.75
 
-        if SAMPLE_FLAG and len(ldf) > SAMPLE_CAP:
+        if ldf._progressive_sample_size is not None:
+            if ldf._sampled is None:
+                if ldf._progressive_sample_size < len(ldf):
+                    ldf._sampled = PandasExecutor.sample_rows(ldf, ldf._progressive_sample_size)
+                else:
+                    ldf._sampled = ldf
+            if ldf._sampled is not ldf:
+                ldf._message.add_unique(
+                    f"Large dataframe detected: Lux is visualizing a random sample of {len(ldf._sampled)} "
+                    "rows, and refining the recommendations on larger samples in the background.",
+                    priority=99,
+                )
+        elif SAMPLE_FLAG and len(ldf) > SAMPLE_CAP:
             if ldf._sampled is None:  # memoize unfiltered sample df
-                ldf._sampled = ldf.sample(n=SAMPLE_CAP, random_state=1)
+                ldf._sampled = PandasExecutor.sample_rows(ldf, SAMPLE_CAP)
             ldf._message.add_unique(
                 f"Large dataframe detected: Lux is only visualizing a random sample capped at {SAMPLE_CAP} rows.",
                 priority=99,
             )
         elif SAMPLE_FLAG and len(ldf) > SAMPLE_START:
             if ldf._sampled is None:  # memoize unfiltered sample df
-                ldf._sampled = ldf.sample(frac=SAMPLE_FRAC, random_state=1)
+                ldf._sampled = PandasExecutor.sample_rows(ldf, round(SAMPLE_FRAC * len(ldf)))
             ldf._message.add_unique(
                 f"Large dataframe detected: Lux is only visualizing a random sample of {len(ldf._sampled)} rows.",
                 priority=99,
             )
         else:
             ldf._sampled = ldf
+        if ldf._sampled is not ldf:
+            # the sample is memoized, while the metadata of the columns is computed as they are requested
+            ldf._sampled.unique_values = ldf.unique_values
+            ldf._sampled.cardinality = ldf.cardinality
+            ldf._sampled._min_max = ldf._min_max
+            ldf._sampled._column_profile = ldf._column_profile
+            ldf._sampled._data_type = ldf._data_type
+
+    @staticmethod
+    def sample_rows(ldf: LuxDataFrame, n: int):
+        """
+        Random sample of n rows of the dataframe, stratified if lux.config.stratified_sampling is set.
+        """
+        if lux.config.stratified_sampling:
+            return PandasExecutor.execute_stratified_sampling(ldf, n)
+        return ldf.sample(n=n, random_state=1)
+
+    @staticmethod
+    def execute_stratified_sampling(ldf: LuxDataFrame, n: int):
+        """
+        Samples n rows of the dataframe uniformly at random, then adds rows of the categories of its
+        low-cardinality nominal attributes that have fewer than STRATIFIED_SAMPLE_MIN_ROWS rows in the
+        sample, so that rare categories do not disappear from the sample.
+        The weight of each sampled row, which is the inverse of its probability of being sampled, is kept
+        in the _sample_weights of the sample, so that counts and sums can be rescaled to the dataframe.
+
+        Parameters
+        ----------
+        ldf : lux.core.frame
+            LuxDataFrame to sample
+        n : int
+            Number of rows sampled uniformly at random
+
+        Returns
+        -------
+        sample: lux.core.frame
+            Sample of the dataframe, with the rows in the order of the dataframe
+        """
+        import numpy as np
+
+        num_rows = len(ldf)
+        random_state = np.random.RandomState(1)
+        selected = np.zeros(num_rows, dtype=bool)
+        selected[random_state.choice(num_rows, size=n, replace=False)] = True
+        # probability of each row being sampled, which is larger for the rows of the rare categories
+        probabilities = np.full(num_rows, n / num_rows)
+        data_type = ldf.data_type
+        for attr in ldf.columns:
+            if data_type.get(attr) != "nominal":
+                continue
+            if ldf.cardinality[attr] > STRATIFIED_SAMPLE_MAX_CARDINALITY:
+                continue
+            codes, _ = pd.factorize(ldf[attr])
+            present = codes >= 0
+            num_categories = codes.max() + 1
+            total_counts = np.bincount(codes[present], minlength=num_categories)
+            sample_counts = np.bincount(codes[present & selected], minlength=num_categories)
+            targets = np.minimum(total_counts, STRATIFIED_SAMPLE_MIN_ROWS)
+            for category in np.flatnonzero(sample_counts < targets):
+                rows = np.flatnonzero(codes == category)
+                unselected = rows[~selected[rows]]
+                missing = targets[category] - sample_counts[category]
+                selected[random_state.choice(unselected, size=missing, replace=False)] = True
+                probabilities[rows] = np.maximum(probabilities[rows], targets[category] / len(rows))
+        positions = np.flatnonzero(selected)
+        sample = ldf.take(positions)
+        if sample.index.is_unique:
+            sample._sample_weights = pd.Series(1 / probabilities[positions], index=sample.index)
+        return sample
+
+    @staticmethod
+    def get_sample_weights(data: pd.DataFrame):
+        """
+        Weights of the rows of data selected from a stratified sample, as an array aligned with the rows,
+        or None if the rows do not come from a stratified sample.
+        """
+        weights = getattr(data, "_sample_weights", None)
+        if weights is None:
+            return None
+        weights = weights.reindex(data.index)
+        if weights.isna().any():
+            return None
+        return weights.to_numpy()
+
+    @staticmethod
+    def get_progressive_sample_sizes(ldf: LuxDataFrame):
+        """
+        Sizes of the samples on which the recommendations of a dataframe are computed one after another
+        when they are refined progressively, from a small sample for a fast first display up to the
+        full data.
+
+        Parameters
+        ----------
+        ldf : lux.core.frame
+            LuxDataFrame to sample
+
+        Returns
+        -------
+        sample_sizes: list[int]
+            Increasing numbers of rows, the last of which is the number of rows of the dataframe
+        """
+        sample_sizes = []
+        size = PROGRESSIVE_SAMPLE_START
+        while size < len(ldf):
+            sample_sizes.append(size)
+            size *= PROGRESSIVE_SAMPLE_GROWTH
+        sample_sizes.append(len(ldf))
+        return sample_sizes
 
     @staticmethod
     def execute(vislist: VisList, ldf: LuxDataFrame):
@@ -82,10 +216,35 @@ class PandasExecutor(Executor):
         None
         """
         PandasExecutor.execute_sampling(ldf)
+        shared_aggregates = PandasExecutor.execute_shared_aggregate(vislist, ldf)
+        shared_histograms = PandasExecutor.execute_shared_binning(vislist, ldf)
+        shared = set(shared_aggregates) | set(shared_histograms)
+        unshared = [vis for vis in vislist if id(vis) not in shared]
+        partitions = PandasExecutor.execute_partitioned_filter(unshared, ldf)
         for vis in vislist:
-            # The vis data starts off being original or sampled dataframe
-            vis._vis_data = ldf._sampled
-            filter_executed = PandasExecutor.execute_filter(vis)
+            # Reuse the aggregated data of a vis with the same intent, if its columns have not been modified since
+            result = ldf._get_vis_result(vis)
+            if result is not None and "data" in result:
+                vis._vis_data = result["data"].copy()
+                continue
+            if id(vis) in shared_aggregates:
+                vis._vis_data, filter_executed, groupby_result = shared_aggregates[id(vis)]
+                PandasExecutor.execute_aggregate(
+                    vis, isFiltered=filter_executed, groupby_result=groupby_result
+                )
+                ldf._save_vis_result(vis, data=vis.data.copy())
+                continue
+            if id(vis) in shared_histograms:
+                vis._vis_data = shared_histograms[id(vis)]
+                ldf._save_vis_result(vis, data=vis.data.copy())
+                continue
+            if id(vis) in partitions:
+                vis._vis_data = partitions[id(vis)]
+                filter_executed = True
+            else:
+                # The vis data starts off being original or sampled dataframe
+                vis._vis_data = ldf._sampled
+                filter_executed = PandasExecutor.execute_filter(vis)
             # Select relevant data based on attribute information
             attributes = set([])
             for clause in vis._inferred_intent:
@@ -96,8 +255,10 @@ class PandasExecutor(Executor):
 
             if vis.mark == "bar" or vis.mark == "line":
                 PandasExecutor.execute_aggregate(vis, isFiltered=filter_executed)
+                ldf._save_vis_result(vis, data=vis.data.copy())
             elif vis.mark == "histogram":
                 PandasExecutor.execute_binning(vis)
+                ldf._save_vis_result(vis, data=vis.data.copy())
             elif vis.mark == "scatter":
                 HBIN_START = 5000
                 if lux.config.heatmap and len(ldf) > HBIN_START:
@@ -110,30 +271,27 @@ class PandasExecutor(Executor):
                     # PandasExecutor.execute_2D_binning(vis) # Lazy Evaluation (Early pruning based on interestingness)
 
     @staticmethod
-    def execute_aggregate(vis: Vis, isFiltered=True):
+    def get_aggregate_attrs(vis: Vis):
         """
-        Aggregate data points on an axis for bar or line charts
+        Finds the attributes that a bar or line chart is grouped by and aggregated over.
 
         Parameters
         ----------
         vis: lux.Vis
             lux.Vis object that represents a visualization
-        ldf : lux.core.frame
-            LuxDataFrame with specified intent.
 
         Returns
         -------
-        None
+        aggregate_attrs: Optional[tuple]
+            The group-by clause, the measure clause, the aggregation function and the color clause (None if
+            the vis has no color), or None if the vis does not aggregate its data
         """
-        import numpy as np
-
         x_attr = vis.get_attr_by_channel("x")[0]
         y_attr = vis.get_attr_by_channel("y")[0]
-        has_color = False
         groupby_attr = ""
         measure_attr = ""
         if x_attr.aggregation is None or y_attr.aggregation is None:
-            return
+            return None
         if y_attr.aggregation != "":
             groupby_attr = x_attr
             measure_attr = y_attr
@@ -142,19 +300,156 @@ class PandasExecutor(Executor):
             groupby_attr = y_attr
             measure_attr = x_attr
             agg_func = x_attr.aggregation
+        if measure_attr == "":
+            return None
+        color_attr = None
+        if len(vis.get_attr_by_channel("color")) == 1:
+            color_attr = vis.get_attr_by_channel("color")[0]
+        return groupby_attr, measure_attr, agg_func, color_attr
+
+    @staticmethod
+    def execute_shared_aggregate(vislist: VisList, ldf: LuxDataFrame):
+        """
+        Aggregates the bar and line charts that have the same filters and group-by attributes together,
+        so that their data is filtered once and the values of the group-by attributes are only hashed once.
+
+        Parameters
+        ----------
+        vislist: list[lux.Vis]
+            vis list that contains lux.Vis objects for visualization.
+        ldf : lux.core.frame
+            LuxDataFrame with specified intent.
+
+        Returns
+        -------
+        shared_aggregates: dict
+            Maps the id of each vis aggregated with others to its filtered data, whether a filter
+            was applied, and the result of its group-by, to be passed to execute_aggregate
+        """
+        groups = {}
+        if getattr(ldf._sampled, "_sample_weights", None) is not None:
+            # the counts and sums of a stratified sample are rescaled by execute_aggregate instead
+            return groups
+        for vis in vislist:
+            if vis.mark != "bar" and vis.mark != "line":
+                continue
+            result = ldf._get_vis_result(vis)
+            if result is not None and "data" in result:
+                continue
+            aggregate_attrs = PandasExecutor.get_aggregate_attrs(vis)
+            if aggregate_attrs is None:
+                continue
+            groupby_attr, measure_attr, agg_func, color_attr = aggregate_attrs
+            keys = (groupby_attr.attribute,)
+            if color_attr is not None:
+                keys = (groupby_attr.attribute, color_attr.attribute)
+            filters = PandasExecutor._get_filter_key(vis)
+            # the data of a vis is projected on the attributes of its clauses, as in execute
+            attributes = set([])
+            for clause in vis._inferred_intent:
+                if clause.attribute != "Record":
+                    attributes.add(clause.attribute)
+            value_columns = [attr for attr in list(attributes) if attr not in keys]
+            groups.setdefault((filters, keys), []).append(
+                (vis, measure_attr.attribute, agg_func, value_columns)
+            )
+
+        shared_aggregates = {}
+        for (filters, keys), members in groups.items():
+            if len(members) < 2:
+                continue
+            vis = members[0][0]
+            vis._vis_data = ldf._sampled
+            filter_executed = PandasExecutor.execute_filter(vis)
+            data = vis.data
+            # selecting columns from the group-by reuses its groups, which are only computed once
+            groupby_result = data.groupby(list(keys), dropna=False)
+            counts = None
+            for vis, measure, agg_func, value_columns in members:
+                if measure == "Record":
+                    if counts is None:
+                        counts = groupby_result.size().to_frame("Record").reset_index()
+                    result = counts.copy()
+                else:
+                    result = groupby_result[value_columns].agg(agg_func).reset_index().__finalize__(data)
+                shared_aggregates[id(vis)] = (data, filter_executed, result)
+        return shared_aggregates
+
+    @staticmethod
+    def _get_filter_key(vis: Vis):
+        return tuple(
+            (repr(clause.attribute), clause.filter_op, repr(clause.value))
+            for clause in utils.get_filter_specs(vis._inferred_intent)
+        )
+
+    @staticmethod
+    def execute_aggregate(vis: Vis, isFiltered=True, groupby_result=None):
+        """
+        Aggregate data points on an axis for bar or line charts
+
+        Parameters
+        ----------
+        vis: lux.Vis
+            lux.Vis object that represents a visualization
+        isFiltered: bool
+            Whether a filter was applied to the data of the vis
+        groupby_result: pd.DataFrame, optional
+            Aggregated data of the vis, when it has been computed together with other visualizations
+            by execute_shared_aggregate
+
+        Returns
+        -------
+        None
+        """
+        import numpy as np
+
+        has_color = False
+        aggregate_attrs = PandasExecutor.get_aggregate_attrs(vis)
+        if aggregate_attrs is None:
+            return
+        groupby_attr, measure_attr, agg_func, color_attr = aggregate_attrs
         if groupby_attr.attribute in vis.data.unique_values.keys():
             attr_unique_vals = vis.data.unique_values[groupby_attr.attribute]
         # checks if color is specified in the Vis
-        if len(vis.get_attr_by_channel("color")) == 1:
-            color_attr = vis.get_attr_by_channel("color")[0]
+        if color_attr is not None:
             color_attr_vals = vis.data.unique_values[color_attr.attribute]
             color_cardinality = len(color_attr_vals)
             # NOTE: might want to have a check somewhere to not use categorical variables with greater than some number of categories as a Color variable----------------
             has_color = True
         else:
             color_cardinality = 1
+        # Zero-filling requires all the unique values, which are not kept for very high cardinality attributes
+        all_unique_vals_known = not utils.unique_values_truncated(vis.data, groupby_attr.attribute)
+        if has_color and utils.unique_values_truncated(vis.data, color_attr.attribute):
+            all_unique_vals_known = False
         if measure_attr != "":
-            if measure_attr.attribute == "Record":
+            keys = [groupby_attr.attribute]
+            if has_color:
+                keys.append(color_attr.attribute)
+            weights = None
+            if groupby_result is None:
+                weights = PandasExecutor.get_sample_weights(vis.data)
+            if groupby_result is not None:
+                vis._vis_data = groupby_result
+            elif weights is not None and measure_attr.attribute == "Record":
+                # the number of records of each group is estimated from the weights of its sampled rows
+                weighted = vis.data[keys].copy()
+                weighted["Record"] = weights
+                vis._vis_data = weighted.groupby(keys, dropna=False).sum().reset_index()
+            elif (
+                weights is not None
+                and agg_func in ("sum", "count")
+                and pd.api.types.is_numeric_dtype(vis.data[measure_attr.attribute])
+            ):
+                measure = measure_attr.attribute
+                weighted = vis.data[keys + [measure]].copy()
+                if agg_func == "sum":
+                    weighted[measure] = weighted[measure] * weights
+                else:
+                    weighted[measure] = np.where(weighted[measure].notna(), weights, 0)
+                intermediate = weighted.groupby(keys, dropna=False).sum().reset_index()
+                vis._vis_data = intermediate.__finalize__(vis.data)
+            elif measure_attr.attribute == "Record":
                 # need to get the index name so that we can rename the index column to "Record"
                 # if there is no index, default to "index"
                 index_name = vis.data.index.name
@@ -199,7 +494,7 @@ class PandasExecutor(Executor):
                 for i in range(0, len(result_vals)):
                     res_color_combi_vals.append([result_vals[i], result_color_vals[i]])
             # For filtered aggregation that have missing groupby-attribute values, set these aggregated value as 0, since no datapoints
-            if isFiltered or has_color and attr_unique_vals:
+            if all_unique_vals_known and (isFiltered or has_color and attr_unique_vals):
                 N_unique_vals = len(attr_unique_vals)
                 if len(result_vals) != N_unique_vals * color_cardinality:
                     columns = vis.data.columns
@@ -283,6 +578,161 @@ class PandasExecutor(Executor):
             binned_result = np.array([bin_center, counts]).T
             vis._vis_data = pd.DataFrame(binned_result, columns=[bin_attr, "Number of Records"])
 
+    @staticmethod
+    def execute_shared_binning(vislist: VisList, ldf: LuxDataFrame):
+        """
+        Bins the histograms that have the same filters together, by binning all of their attributes
+        as a single block of values in one pass, instead of one attribute after another.
+
+        Parameters
+        ----------
+        vislist: list[lux.Vis]
+            vis list that contains lux.Vis objects for visualization.
+        ldf : lux.core.frame
+            LuxDataFrame with specified intent.
+
+        Returns
+        -------
+        shared_histograms: dict
+            Maps the id of each vis binned with others to its binned data, as computed by execute_binning
+        """
+        import numpy as np
+
+        groups = {}
+        for vis in vislist:
+            if vis.mark != "histogram":
+                continue
+            result = ldf._get_vis_result(vis)
+            if result is not None and "data" in result:
+                continue
+            bin_attribute = list(filter(lambda x: x.bin_size != 0, vis._inferred_intent))[0]
+            dtype = ldf.dtypes[bin_attribute.attribute]
+            if not isinstance(dtype, np.dtype) or dtype.kind not in "iuf":
+                continue
+            key = (PandasExecutor._get_filter_key(vis), bin_attribute.bin_size)
+            groups.setdefault(key, []).append((vis, bin_attribute.attribute))
+
+        shared_histograms = {}
+        for (filters, bin_size), members in groups.items():
+            if len(members) < 2:
+                continue
+            vis = members[0][0]
+            vis._vis_data = ldf._sampled
+            PandasExecutor.execute_filter(vis)
+            data = vis.data
+            attributes = list(dict.fromkeys(attr for _, attr in members))
+            columns = [data[attr].to_numpy(dtype="float64") for attr in attributes]
+            ranges = [
+                PandasExecutor._get_value_range(ldf, data, attr, values)
+                for attr, values in zip(attributes, columns)
+            ]
+            # columns without values are left to execute_binning, as well as infinite ranges that np.histogram rejects
+            binned = [
+                i for i, (first, last) in enumerate(ranges) if np.isfinite(first) and np.isfinite(last)
+            ]
+            if not binned:
+                continue
+            counts, bin_edges = PandasExecutor.execute_block_binning(
+                [columns[i] for i in binned],
+                np.array([ranges[i][0] for i in binned], dtype="float64"),
+                np.array([ranges[i][1] for i in binned], dtype="float64"),
+                bin_size,
+            )
+            results = {}
+            for i, attr_counts, attr_edges in zip(binned, counts, bin_edges):
+                attr = attributes[i]
+                # bin_edges of size N+1, so need to compute bin_center as the bin location
+                bin_center = np.mean(np.vstack([attr_edges[0:-1], attr_edges[1:]]), axis=0)
+                binned_result = np.array([bin_center, attr_counts]).T
+                results[attr] = pd.DataFrame(binned_result, columns=[attr, "Number of Records"])
+            for vis, attr in members:
+                if attr in results:
+                    shared_histograms[id(vis)] = results[attr].copy()
+        return shared_histograms
+
+    @staticmethod
+    def _get_value_range(ldf, data, attr, values):
+        import numpy as np
+
+        if data is ldf and attr in ldf._min_max:
+            # the data is the whole dataframe, so its range is known from the metadata
+            return ldf._min_max[attr]
+        if np.isnan(values).all():
+            return (np.nan, np.nan)
+        return (np.nanmin(values), np.nanmax(values))
+
+    @staticmethod
+    def execute_block_binning(columns, first_edges, last_edges, bin_size):
+        """
+        Computes the histogram of several columns of the same length at once, with the same bins as
+        np.histogram: bin_size equal-width bins between the first and last edge of each column.
+        The columns are binned together one block of rows at a time, and missing values are ignored.
+
+        Parameters
+        ----------
+        columns : list[np.ndarray]
+            Float values of each column to bin
+        first_edges : np.ndarray
+            Lower edge of the first bin of each column
+        last_edges : np.ndarray
+            Upper edge of the last bin of each column
+        bin_size : int
+            Number of bins
+
+        Returns
+        -------
+        counts: np.ndarray
+            Number of values in each bin, with one row per column
+        bin_edges: np.ndarray
+            Edges of the bins, with one row per column
+        """
+        import numpy as np
+
+        num_columns = len(columns)
+        first_edges = first_edges.copy()
+        last_edges = last_edges.copy()
+        same = first_edges == last_edges
+        first_edges[same] -= 0.5
+        last_edges[same] += 0.5
+        bin_edges = np.linspace(first_edges, last_edges, bin_size + 1, endpoint=True, axis=1)
+        norm = bin_size / (last_edges - first_edges)
+        scale = np.maximum(abs(first_edges), abs(last_edges)) * norm + bin_size
+        tolerance = 8 * np.finfo(np.float64).eps * scale
+        flat_edges = bin_edges.ravel()
+        column_offsets = np.arange(num_columns) * (bin_size + 1)
+        counts = np.zeros(num_columns * (bin_size + 1), dtype=np.intp)
+        # bin a block of rows at a time, so that the intermediate arrays fit in the cache
+        block_rows = max(1, BINNING_BLOCK_SIZE // max(num_columns, 1))
+        num_rows = len(columns[0]) if num_columns > 0 else 0
+        for start in range(0, num_rows, block_rows):
+            values = np.column_stack([column[start : start + block_rows] for column in columns])
+            keep = (values >= first_edges) & (values <= last_edges)
+            positions = values - first_edges
+            positions *= norm
+            # values outside of the range (including missing values) are counted in an extra bin, then dropped
+            positions[~keep] = bin_size + 1
+            indices = positions.astype(np.intp)
+            indices[indices == bin_size] -= 1
+            indices[~keep] = bin_size
+            # only the values within rounding error of an edge may fall on its other side, so only these
+            # are compared with the edges themselves, like np.histogram does for every value
+            fractions = positions - indices
+            rows, cols = np.nonzero(keep & ((fractions < tolerance) | (fractions > 1 - tolerance)))
+            if len(rows) > 0:
+                near_values = values[rows, cols]
+                near_indices = indices[rows, cols]
+                offsets = column_offsets[cols]
+                near_indices[near_values < flat_edges[offsets + near_indices]] -= 1
+                increment = (near_values >= flat_edges[offsets + near_indices + 1]) & (
+                    near_indices != bin_size - 1
+                )
+                near_indices[increment] += 1
+                indices[rows, cols] = near_indices
+            indices += column_offsets
+            counts += np.bincount(indices.ravel(), minlength=len(counts))
+        counts = counts.reshape(num_columns, bin_size + 1)[:, :bin_size]
+        return counts, bin_edges
+
     @staticmethod
     def execute_filter(vis: Vis):
         assert (
@@ -292,14 +742,73 @@ class PandasExecutor(Executor):
 
         if filters:
             # TODO: Need to handle OR logic
-            for filter in filters:
-                vis._vis_data = PandasExecutor.apply_filter(
-                    vis.data, filter.attribute, filter.filter_op, filter.value
-                )
+            vis._vis_data = PandasExecutor.apply_filters(vis.data, filters)
             return True
         else:
             return False
 
+    @staticmethod
+    def execute_partitioned_filter(vislist: VisList, ldf: LuxDataFrame):
+        """
+        Filters the visualizations that differ only in the value of an equality filter on the same
+        attribute together, by partitioning the data on that attribute with a single group-by,
+        instead of scanning the whole data once for each value.
+
+        Parameters
+        ----------
+        vislist: list[lux.Vis]
+            vis list that contains lux.Vis objects for visualization.
+        ldf : lux.core.frame
+            LuxDataFrame with specified intent.
+
+        Returns
+        -------
+        partitions: dict
+            Maps the id of each vis filtered with others to its filtered data, as execute_filter computes it
+        """
+        import numpy as np
+        from pandas.api.types import is_categorical_dtype, is_datetime64_any_dtype
+
+        groups = {}
+        for vis in vislist:
+            result = ldf._get_vis_result(vis)
+            if result is not None and "data" in result:
+                continue
+            filters = utils.get_filter_specs(vis._inferred_intent)
+            if not filters:
+                continue
+            fltr = filters[-1]
+            if fltr.filter_op != "=" or utils.like_nan(fltr.value) or fltr.attribute not in ldf.columns:
+                continue
+            # equality on datetime and categorical columns does not match their group-by keys one to one
+            dtype = ldf.dtypes[fltr.attribute]
+            if is_datetime64_any_dtype(dtype) or is_categorical_dtype(dtype):
+                continue
+            other_filters = tuple(
+                (repr(clause.attribute), clause.filter_op, repr(clause.value)) for clause in filters[:-1]
+            )
+            groups.setdefault((other_filters, fltr.attribute), []).append(
+                (vis, filters[:-1], fltr.value)
+            )
+
+        partitions = {}
+        for (_, attribute), members in groups.items():
+            if len(members) < 2:
+                continue
+            data = PandasExecutor.apply_filters(ldf._sampled, members[0][1])
+            # positions of the rows of each value of the attribute, where missing values are left out
+            # just like an equality filter on a non-missing value does
+            indices = data.groupby(attribute, sort=False).indices
+            empty = np.array([], dtype=np.intp)
+            for vis, _, value in members:
+                try:
+                    positions = indices.get(value, empty)
+                except TypeError:
+                    # unhashable filter values are left to execute_filter
+                    continue
+                partitions[id(vis)] = data.take(positions)
+        return partitions
+
     @staticmethod
     def apply_filter(df: pd.DataFrame, attribute: str, op: str, val: object) -> pd.DataFrame:
         """
@@ -321,29 +830,136 @@ class PandasExecutor(Executor):
         df: pandas.DataFrame
             Dataframe resulting from the filter operation
         """
+        clause = lux.Clause(attribute=attribute, filter_op=op, value=val)
+        return PandasExecutor.apply_filters(df, [clause])
+
+    @staticmethod
+    def apply_filters(df: pd.DataFrame, filters: list) -> pd.DataFrame:
+        """
+        Applies all the given filters to a dataframe, by combining their bitmaps before selecting
+        the rows of the dataframe once.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Dataframe to filter on
+        filters : list[lux.Clause]
+            Filter clauses, whose conditions must all hold
+
+        Returns
+        -------
+        df: pandas.DataFrame
+            Dataframe resulting from the filter operations
+        """
+        import numpy as np
+
+        return df.take(np.flatnonzero(PandasExecutor.get_filter_mask(df, filters)))
+
+    @staticmethod
+    def get_filter_mask(df: pd.DataFrame, filters: list):
+        """
+        Computes which rows of a dataframe satisfy all the given filters.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Dataframe to filter on
+        filters : list[lux.Clause]
+            Filter clauses, whose conditions must all hold
+
+        Returns
+        -------
+        mask: np.ndarray
+            Boolean array that is True for the rows of the dataframe that satisfy the filters
+        """
+        import numpy as np
+
+        bitmap = None
+        for clause in filters:
+            clause_bitmap = PandasExecutor.get_filter_bitmap(
+                df, clause.attribute, clause.filter_op, clause.value
+            )
+            if clause_bitmap is None:
+                continue
+            bitmap = clause_bitmap if bitmap is None else bitmap & clause_bitmap
+        if bitmap is None:
+            return np.ones(len(df), dtype=bool)
+        # the padding bits of the last byte are sliced off, as the count of np.unpackbits needs numpy 1.17
+        return np.unpackbits(bitmap)[: len(df)].view(bool)
+
+    @staticmethod
+    def get_filter_bitmap(df: pd.DataFrame, attribute: str, op: str, val: object):
+        """
+        Computes the rows of a dataframe that satisfy a filter, as a bitmap packed with np.packbits.
+        The bitmaps of a LuxDataFrame are cached until its data is modified, keeping the most recently
+        used bitmaps up to FILTER_CACHE_SIZE bytes.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Dataframe to filter on
+        attribute : str
+            Filter attribute
+        op : str
+            Filter operation, '=', '<', '>', '<=', '>=', '!='
+        val : object
+            Filter value
+
+        Returns
+        -------
+        bitmap: Optional[np.ndarray]
+            Packed bitmap of the rows that satisfy the filter, or None if the filter operation is not
+            supported, in which case the filter keeps every row
+        """
+        import numpy as np
+
+        key = (attribute, op, repr(val))
+        cache = None
+        if isinstance(df, LuxDataFrame):
+            if df._filter_bitmaps is None or df._filter_bitmaps[0] != df._data_version:
+                df._filter_bitmaps = (df._data_version, OrderedDict())
+            cache = df._filter_bitmaps[1]
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        mask = PandasExecutor._compute_filter_mask(df, attribute, op, val)
+        bitmap = None
+        if mask is not None:
+            bitmap = np.packbits(mask.to_numpy(dtype=bool, na_value=False))
+        if cache is not None:
+            cache[key] = bitmap
+            size = sum(cached.nbytes for cached in cache.values() if cached is not None)
+            while size > FILTER_CACHE_SIZE and len(cache) > 1:
+                _, evicted = cache.popitem(last=False)
+                if evicted is not None:
+                    size -= evicted.nbytes
+        return bitmap
+
+    @staticmethod
+    def _compute_filter_mask(df: pd.DataFrame, attribute: str, op: str, val: object):
         # Handling NaN filter values
         if utils.like_nan(val):
             if op != "=" and op != "!=":
                 warnings.warn("Filter on NaN must be used with equality operations (i.e., `=` or `!=`)")
             else:
                 if op == "=":
-                    return df[df[attribute].isna()]
+                    return df[attribute].isna()
                 elif op == "!=":
-                    return df[~df[attribute].isna()]
+                    return ~df[attribute].isna()
         # Applying filter in regular, non-NaN cases
         if op == "=":
-            return df[df[attribute] == val]
+            return df[attribute] == val
         elif op == "<":
-            return df[df[attribute] < val]
+            return df[attribute] < val
         elif op == ">":
-            return df[df[attribute] > val]
+            return df[attribute] > val
         elif op == "<=":
-            return df[df[attribute] <= val]
+            return df[attribute] <= val
         elif op == ">=":
-            return df[df[attribute] >= val]
+            return df[attribute] >= val
         elif op == "!=":
-            return df[df[attribute] != val]
-        return df
+            return df[attribute] != val
+        return None
 
     @staticmethod
     def execute_2D_binning(vis: Vis):
@@ -395,62 +1011,99 @@ class PandasExecutor(Executor):
         ldf._data_type = {}
         self.compute_data_type(ldf)
 
-    def compute_data_type(self, ldf: LuxDataFrame):
+    def compute_data_type(self, ldf: LuxDataFrame, columns=None):
+        if columns is None:
+            columns = list(ldf.columns)
+        dtypes = ldf.dtypes
+        data_types = self.map_columns(lambda attr: self._infer_data_type(ldf, attr, dtypes), columns)
+        for attr, data_type in zip(columns, data_types):
+            ldf._data_type[attr] = data_type
+        if not pd.api.types.is_integer_dtype(ldf.index) and ldf.index.name:
+            ldf._data_type[ldf.index.name] = "nominal"
+        self.warn_temporal_attributes(ldf, columns)
+
+    def _infer_data_type(self, ldf: LuxDataFrame, attr, dtypes):
         from pandas.api.types import is_datetime64_any_dtype as is_datetime
 
-        for attr in list(ldf.columns):
-            if attr in ldf._type_override:
-                ldf._data_type[attr] = ldf._type_override[attr]
+        if attr in ldf._type_override:
+            return ldf._type_override[attr]
+        if isinstance(attr, pd._libs.tslibs.timestamps.Timestamp):
+            return "temporal"
+        temporal_var_list = ["month", "year", "day", "date", "time", "weekday"]
+        dtype = dtypes[attr]
+        # the type checks below only need to look at the unique values gathered by compute_stats,
+        # or at a sample of the rows of the columns whose unique values were truncated
+        if is_datetime(dtype):
+            return "temporal"
+        elif dtype == object and self._is_datetime_string(self._datetime_check_values(ldf, attr, dtype)):
+            return "temporal"
+        elif str(attr).lower() in temporal_var_list:
+            return "temporal"
+        elif dtype == int and self._is_datetime_number(self._datetime_check_values(ldf, attr, dtype)):
+            return "temporal"
+        elif pd.api.types.is_float_dtype(dtype):
+            # int columns gets coerced into floats if contain NaN
+            convertible2int = ldf._column_profile[attr]["integral"]
+            if convertible2int and ldf.cardinality[attr] != len(ldf) and ldf.cardinality[attr] < 20:
+                return "nominal"
             else:
-                temporal_var_list = ["month", "year", "day", "date", "time", "weekday"]
-                if is_datetime(ldf[attr]):
-                    ldf._data_type[attr] = "temporal"
-                elif self._is_datetime_string(ldf[attr]):
-                    ldf._data_type[attr] = "temporal"
-                elif isinstance(attr, pd._libs.tslibs.timestamps.Timestamp):
-                    ldf._data_type[attr] = "temporal"
-                elif str(attr).lower() in temporal_var_list:
-                    ldf._data_type[attr] = "temporal"
-                elif self._is_datetime_number(ldf[attr]):
-                    ldf._data_type[attr] = "temporal"
-                elif pd.api.types.is_float_dtype(ldf.dtypes[attr]):
-                    # int columns gets coerced into floats if contain NaN
-                    convertible2int = pd.api.types.is_integer_dtype(ldf[attr].convert_dtypes())
-                    if (
-                        convertible2int
-                        and ldf.cardinality[attr] != len(ldf)
-                        and ldf.cardinality[attr] < 20
-                    ):
-                        ldf._data_type[attr] = "nominal"
-                    else:
-                        ldf._data_type[attr] = "quantitative"
-                elif pd.api.types.is_integer_dtype(ldf.dtypes[attr]):
-                    # See if integer value is quantitative or nominal by checking if the ratio of cardinality/data size is less than 0.4 and if there are less than 10 unique values
-                    if ldf.pre_aggregated:
-                        if ldf.cardinality[attr] == len(ldf):
-                            ldf._data_type[attr] = "nominal"
-                    if ldf.cardinality[attr] / len(ldf) < 0.4 and ldf.cardinality[attr] < 20:
-                        ldf._data_type[attr] = "nominal"
-                    else:
-                        ldf._data_type[attr] = "quantitative"
-                    if check_if_id_like(ldf, attr):
-                        ldf._data_type[attr] = "id"
-                # Eliminate this clause because a single NaN value can cause the dtype to be object
-                elif pd.api.types.is_string_dtype(ldf.dtypes[attr]):
-                    if check_if_id_like(ldf, attr):
-                        ldf._data_type[attr] = "id"
-                    else:
-                        ldf._data_type[attr] = "nominal"
-                # check if attribute is any type of datetime dtype
-                elif is_datetime_series(ldf.dtypes[attr]):
-                    ldf._data_type[attr] = "temporal"
-                else:
-                    ldf._data_type[attr] = "nominal"
-        if not pd.api.types.is_integer_dtype(ldf.index) and ldf.index.name:
-            ldf._data_type[ldf.index.name] = "nominal"
+                return "quantitative"
+        elif pd.api.types.is_integer_dtype(dtype):
+            # See if integer value is quantitative or nominal by checking if the ratio of cardinality/data size is less than 0.4 and if there are less than 10 unique values
+            if ldf.cardinality[attr] / len(ldf) < 0.4 and ldf.cardinality[attr] < 20:
+                return "nominal"
+            elif check_if_id_like(ldf, attr):
+                return "id"
+            else:
+                return "quantitative"
+        # Eliminate this clause because a single NaN value can cause the dtype to be object
+        elif pd.api.types.is_string_dtype(dtype):
+            if check_if_id_like(ldf, attr):
+                return "id"
+            else:
+                return "nominal"
+        # check if attribute is any type of datetime dtype
+        elif is_datetime_series(dtype):
+            return "temporal"
+        else:
+            return "nominal"
+
+    @staticmethod
+    def map_columns(func, columns):
+        """
+        Applies func to each of the columns, using up to lux.config.num_workers threads.
+
+        Parameters
+        ----------
+        func : Callable
+            Function computing the metadata of a single column
+        columns : list
+            Columns to process
+
+        Returns
+        -------
+        results: list
+            Result of func for each column, in the same order as columns
+        """
+        columns = list(columns)
+        num_workers = min(lux.config.num_workers, len(columns))
+        if num_workers <= 1:
+            return [func(attr) for attr in columns]
+        from concurrent.futures import ThreadPoolExecutor
+
+        # the per-column work mostly runs in numpy and pandas routines that release the GIL
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            return list(pool.map(func, columns))
+
+    @staticmethod
+    def warn_temporal_attributes(ldf: LuxDataFrame, columns):
+        """
+        Warns about the columns detected as temporal that are not stored as Pandas Datetime objects.
+        """
+        from pandas.api.types import is_datetime64_any_dtype as is_datetime
 
         non_datetime_attrs = []
-        for attr in ldf.columns:
+        for attr in columns:
             if ldf._data_type[attr] == "temporal" and not is_datetime(ldf[attr]):
                 non_datetime_attrs.append(attr)
         warn_msg = ""
@@ -467,6 +1120,27 @@ class PandasExecutor(Executor):
             warn_msg += f"\n\tdf.set_data_type({{'{attr}':'quantitative'}})"
             warnings.warn(warn_msg, stacklevel=2)
 
+    @staticmethod
+    def _datetime_check_values(ldf: LuxDataFrame, attr, dtype):
+        """
+        Values of a column that are parsed to check whether the column holds datetimes.
+
+        These are the unique values of the column, unless only its most frequent values were kept
+        because it has more than ``lux.config.unique_values_cap`` unique values. The most frequent
+        values may all be datetimes while the other values are not, so the unique values of a bounded
+        random sample of the rows of the column are checked instead.
+        """
+        import numpy as np
+
+        SAMPLE_SIZE = 10000
+        if not utils.unique_values_truncated(ldf, attr):
+            return pd.Series(ldf.unique_values[attr], dtype=dtype)
+        series = ldf[attr]
+        if len(series) > SAMPLE_SIZE:
+            rows = np.random.RandomState(99).choice(len(series), size=SAMPLE_SIZE, replace=False)
+            series = series.iloc[rows]
+        return pd.Series(series.unique(), dtype=dtype)
+
     @staticmethod
     def _is_datetime_string(series):
         if series.dtype == object:
@@ -476,53 +1150,196 @@ class PandasExecutor(Executor):
             except Exception as e:
                 not_numeric = True
 
-            datetime_col = None
             if not_numeric:
-                try:
-                    datetime_col = pd.to_datetime(series)
-                except Exception as e:
-                    return False
-            if datetime_col is not None:
-                return True
+                return PandasExecutor._parse_as_datetime(series)
         return False
 
     @staticmethod
     def _is_datetime_number(series):
         if series.dtype == int:
+            return PandasExecutor._parse_as_datetime(series, to_str=True)
+        return False
+
+    @staticmethod
+    def _parse_as_datetime(series, to_str=False):
+        """
+        Check whether all the values of a series can be parsed as datetimes.
+
+        A bounded sample of the values is parsed first, which settles the common case where
+        the values are not datetimes. Only when the whole sample parses are all the values
+        parsed, inferring the datetime format from the first value so that the values are parsed
+        with the same format instead of one by one (falling back to parsing them one by one if
+        they do not share a format).
+
+        Parameters
+        ----------
+        series : pd.Series
+            Values to parse (the unique values of a column)
+        to_str : bool
+            Whether the values should be converted to strings before being parsed
+
+        Returns
+        -------
+        bool
+            Whether the values are datetimes
+        """
+        import numpy as np
+
+        SAMPLE_SIZE = 100
+        if len(series) > SAMPLE_SIZE:
+            # the rows are sampled without replacement, so that the sample has SAMPLE_SIZE distinct rows
+            rows = np.random.RandomState(99).choice(len(series), size=SAMPLE_SIZE, replace=False)
+            sample = series.iloc[rows]
             try:
-                temp = series.astype(str)
-                pd.to_datetime(temp)
-                return True
+                pd.to_datetime(sample.astype(str) if to_str else sample)
             except Exception:
+                # a value of the sample that can not be parsed can not be parsed in the whole series either
                 return False
-        return False
+        try:
+            pd.to_datetime(series.astype(str) if to_str else series, infer_datetime_format=True)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def compute_column_profile(series: pd.Series) -> dict:
+        """
+        Profile a column with a single hashing pass over its values.
+
+        The unique values, their number of occurrences and the number of missing values are all
+        derived from one ``factorize`` call, so that the remaining statistics (cardinality, min/max
+        and dtype hints) only need to look at the unique values instead of rescanning every row.
+
+        If the column has more unique values than ``lux.config.unique_values_cap``, only its most
+        frequent (non-missing) values are kept, so that the stored metadata stays bounded
+        regardless of the number of rows.
+
+        Parameters
+        ----------
+        series : pd.Series
+            Column to profile
+
+        Returns
+        -------
+        profile: dict
+            Dictionary containing the ``unique_values`` (in order of appearance, including missing
+            values, as returned by ``Series.unique``), the aligned ``value_counts``, the exact
+            ``cardinality``, the ``null_count``, whether the unique values were ``truncated``,
+            the ``min_max`` of numeric columns (None otherwise) and the ``integral`` hint indicating
+            whether all values of a float column are whole numbers.
+        """
+        import numpy as np
+
+        TOPK_VALUES = 100
+        cap = lux.config.unique_values_cap
+
+        dtype = series.dtype
+        codes, uniques = series.factorize()
+        # shift codes by one so that missing values (code -1) are counted in the first bin
+        counts = np.bincount(codes + 1, minlength=len(uniques) + 1)
+        null_count = int(counts[0])
+        value_counts = counts[1:]
+        null_groups = []
+        if null_count > 0:
+            # Series.unique keeps each kind of missing value at the position where it first occurs
+            null_positions = np.flatnonzero(codes == -1)
+            null_values = series.values[null_positions]
+            if dtype == object and len(pd.unique(null_values)) > 1:
+                # object columns can mix None and NaN, which Series.unique reports separately
+                groups = {}
+                for pos, val in zip(null_positions, null_values):
+                    key = "nan" if isinstance(val, float) else type(val)
+                    if key not in groups:
+                        groups[key] = [pos, val, 0]
+                    groups[key][2] += 1
+                null_groups = list(groups.values())
+            else:
+                null_groups = [[null_positions[0], null_values[0], null_count]]
+        cardinality = len(uniques) + len(null_groups)
+        truncated = cap is not None and cardinality > cap
+
+        if truncated:
+            # only keep the most frequent values, ordered by decreasing number of occurrences
+            k = min(TOPK_VALUES, cap, len(uniques))
+            top = (
+                np.sort(np.argpartition(-value_counts, k - 1)[:k]) if k > 0 else np.array([], dtype=int)
+            )
+            top = top[np.argsort(-value_counts[top], kind="stable")]
+            if isinstance(dtype, np.dtype):
+                unique_values = list(np.asarray(uniques)[top])
+            else:
+                unique_values = list(uniques[top])
+            value_counts = value_counts[top]
+        else:
+            if isinstance(dtype, np.dtype):
+                unique_values = list(np.asarray(uniques))
+            else:
+                # extension dtypes rely on pandas to box their unique values
+                unique_values = list(series.unique())
+            for i, (pos, val, count) in enumerate(null_groups):
+                null_idx = (int(codes[:pos].max()) + 1 if pos > 0 else 0) + i
+                value_counts = np.insert(value_counts, null_idx, count)
+                if isinstance(dtype, np.dtype):
+                    unique_values.insert(null_idx, val)
 
-    def compute_stats(self, ldf: LuxDataFrame):
-        # precompute statistics
-        ldf.unique_values = {}
-        ldf._min_max = {}
-        ldf.cardinality = {}
+        min_max = None
+        integral = False
+        if pd.api.types.is_float_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            if len(uniques) > 0:
+                min_max = (uniques.min(), uniques.max())
+            else:
+                min_max = (series.min(), series.max())
+        if pd.api.types.is_float_dtype(dtype):
+            vals = np.asarray(uniques, dtype=float)
+            integral = bool(
+                np.isfinite(vals).all()
+                and (np.abs(vals) < 2 ** 63).all()
+                and (vals == np.floor(vals)).all()
+            )
+        return {
+            "unique_values": unique_values,
+            "value_counts": value_counts.tolist(),
+            "cardinality": cardinality,
+            "null_count": null_count,
+            "truncated": truncated,
+            "min_max": min_max,
+            "integral": integral,
+        }
 
-        for attribute in ldf.columns:
+    def compute_stats(self, ldf: LuxDataFrame, columns=None):
+        # precompute statistics (of the given columns only, in the dictionaries copied by maintain_metadata)
+        compute_index = columns is None
+        if columns is None:
+            ldf.unique_values = {}
+            ldf._min_max = {}
+            ldf.cardinality = {}
+            ldf._column_profile = {}
+            columns = ldf.columns
 
+        attribute_reprs = []
+        for attribute in columns:
             if isinstance(attribute, pd._libs.tslibs.timestamps.Timestamp):
                 # If timestamp, make the dictionary keys the _repr_ (e.g., TimeStamp('2020-04-05 00.000')--> '2020-04-05')
-                attribute_repr = str(attribute._date_repr)
+                attribute_reprs.append(str(attribute._date_repr))
             else:
-                attribute_repr = attribute
+                attribute_reprs.append(attribute)
 
-            ldf.unique_values[attribute_repr] = list(ldf[attribute_repr].unique())
-            ldf.cardinality[attribute_repr] = len(ldf.unique_values[attribute_repr])
-
-            if pd.api.types.is_float_dtype(ldf.dtypes[attribute]) or pd.api.types.is_integer_dtype(
-                ldf.dtypes[attribute]
-            ):
-                ldf._min_max[attribute_repr] = (
-                    ldf[attribute].min(),
-                    ldf[attribute].max(),
-                )
+        # the columns are selected up front, so that the worker threads only read from them
+        series_list = [ldf[attribute_repr] for attribute_repr in attribute_reprs]
+        profiles = self.map_columns(self.compute_column_profile, series_list)
+        for attribute_repr, profile in zip(attribute_reprs, profiles):
+            ldf.unique_values[attribute_repr] = profile.pop("unique_values")
+            ldf.cardinality[attribute_repr] = profile.pop("cardinality")
+            min_max = profile.pop("min_max")
+            if min_max is not None:
+                ldf._min_max[attribute_repr] = min_max
+            else:
+                ldf._min_max.pop(attribute_repr, None)
+            ldf._column_profile[attribute_repr] = profile
 
-        if not pd.api.types.is_integer_dtype(ldf.index):
-            index_column_name = ldf.index.name
+        index_column_name = ldf.index.name
+        if not pd.api.types.is_integer_dtype(ldf.index) and (
+            compute_index or index_column_name not in ldf.unique_values
+        ):
             ldf.unique_values[index_column_name] = list(ldf.index)
             ldf.cardinality[index_column_name] = len(ldf.index)
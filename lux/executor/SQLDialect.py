@@ -0,0 +1,290 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pandas as pd
+
+
+class SQLDialect:
+    """
+    SQL constructs that differ across databases, used by the SQLExecutor and the SQL metadata of LuxDataFrame.
+    """
+
+    name = ""
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__}>"
+
+    @staticmethod
+    def quote(identifier):
+        """
+        Quotes the name of a column, so that it may contain upper case letters, spaces or keywords.
+        """
+        return '"' + str(identifier).replace('"', '""') + '"'
+
+    @staticmethod
+    def literal(value):
+        """
+        Formats a filter value as a SQL literal.
+        """
+        import numbers
+
+        if isinstance(value, bool):
+            return "TRUE" if value else "FALSE"
+        if isinstance(value, numbers.Number):
+            return repr(value.item() if hasattr(value, "item") else value)
+        return "'" + str(value).replace("'", "''") + "'"
+
+    @staticmethod
+    def random():
+        """
+        Function returning a random number for each row, to order the rows of a table randomly.
+        """
+        return "random()"
+
+    @staticmethod
+    def batch_key(expression):
+        """
+        Converts the group-by values of queries combined with UNION ALL to a type that they all share.
+        """
+        return expression
+
+    @staticmethod
+    def batch_value(expression):
+        """
+        Converts the aggregated values of queries combined with UNION ALL to a type that they all share.
+        """
+        return expression
+
+    @staticmethod
+    def decode_keys(keys, unique_values):
+        """
+        Converts the group-by values converted by batch_key back to the values of the column.
+        """
+        return keys
+
+    def get_modification_marker(self, table_name, connection):
+        """
+        Retrieves a value that changes when the rows of a table are modified, or None if it is unknown.
+        """
+        return None
+
+    def get_cardinality_estimates(self, table_name, connection):
+        """
+        Retrieves the numbers of distinct values that the statistics catalog of the database estimates for the
+        columns of a table, as last collected by ANALYZE.
+
+        Returns
+        -------
+        estimates: dict
+            Maps the name of each column with statistics to its estimated number of distinct values
+        """
+        return {}
+
+    def get_column_types(self, table_name, connection):
+        """
+        Retrieves the names and types of the columns of a table, in the order of the table.
+
+        Returns
+        -------
+        column_types: dict
+            Maps the name of each column to its type, as declared in the database
+        """
+        raise NotImplementedError
+
+    def get_type_category(self, sql_type):
+        """
+        Classifies a column type as "nominal", "numeric" or "temporal", or None if Lux does not visualize it.
+        """
+        raise NotImplementedError
+
+    def bucket(self, attribute, first, last, bin_size):
+        """
+        Expression of the bin of each value of a column, numbered from 0 to bin_size - 1, for bin_size
+        equal-width bins between first and last (included) as np.histogram computes them.
+        """
+        raise NotImplementedError
+
+
+class PostgresDialect(SQLDialect):
+    name = "postgresql"
+
+    @staticmethod
+    def batch_key(expression):
+        return f"CAST({expression} AS TEXT)"
+
+    @staticmethod
+    def batch_value(expression):
+        return f"CAST({expression} AS DOUBLE PRECISION)"
+
+    @staticmethod
+    def decode_keys(keys, unique_values):
+        values = {}
+        for val in unique_values:
+            if isinstance(val, bool):
+                values[str(val).lower()] = val
+            elif val is not None:
+                values[str(val)] = val
+        return [values.get(key, key) for key in keys]
+
+    def get_column_types(self, table_name, connection):
+        schema = None
+        if "." in table_name:
+            schema, table_name = table_name.split(".", 1)
+        query = (
+            "SELECT column_name, data_type FROM INFORMATION_SCHEMA.COLUMNS "
+            f"WHERE TABLE_NAME = {self.literal(table_name)}"
+        )
+        if schema is not None:
+            query += f" AND TABLE_SCHEMA = {self.literal(schema)}"
+        query += " ORDER BY ordinal_position"
+        columns = pd.read_sql(query, connection)
+        return dict(zip(columns["column_name"], columns["data_type"]))
+
+    def get_modification_marker(self, table_name, connection):
+        # number of rows inserted, updated or deleted since the statistics of the database were reset
+        schema = None
+        if "." in table_name:
+            schema, table_name = table_name.split(".", 1)
+        query = (
+            "SELECT n_tup_ins + n_tup_upd + n_tup_del AS marker FROM pg_stat_user_tables "
+            f"WHERE relname = {self.literal(table_name)}"
+        )
+        if schema is not None:
+            query += f" AND schemaname = {self.literal(schema)}"
+        markers = list(pd.read_sql(query, connection)["marker"])
+        return markers[0] if markers else None
+
+    def get_cardinality_estimates(self, table_name, connection):
+        schema = None
+        if "." in table_name:
+            schema, table_name = table_name.split(".", 1)
+        query = (
+            "SELECT s.attname, s.n_distinct, c.reltuples FROM pg_stats s "
+            "JOIN pg_namespace n ON n.nspname = s.schemaname "
+            "JOIN pg_class c ON c.relnamespace = n.oid AND c.relname = s.tablename "
+            f"WHERE s.tablename = {self.literal(table_name)}"
+        )
+        if schema is not None:
+            query += f" AND s.schemaname = {self.literal(schema)}"
+        stats = pd.read_sql(query, connection)
+        estimates = {}
+        for attr, n_distinct, row_count in zip(
+            stats["attname"], stats["n_distinct"], stats["reltuples"]
+        ):
+            # a negative n_distinct is minus the fraction of distinct rows, for columns that grow with the table
+            estimates[attr] = n_distinct if n_distinct >= 0 else -n_distinct * max(row_count, 0)
+        return estimates
+
+    def get_type_category(self, sql_type):
+        if sql_type in ["character", "character varying", "boolean", "uuid", "text"]:
+            return "nominal"
+        elif sql_type in ["integer", "real", "smallint", "smallserial", "serial"]:
+            return "numeric"
+        elif "time" in sql_type or "date" in sql_type:
+            return "temporal"
+        return None
+
+    def bucket(self, attribute, first, last, bin_size):
+        # width_bucket numbers the bins from 1, and puts the values equal to last in an extra bin
+        return (
+            f"LEAST(width_bucket({self.quote(attribute)}, {float(first)!r}, {float(last)!r}, {bin_size}), "
+            f"{bin_size}) - 1"
+        )
+
+
+class SQLiteDialect(SQLDialect):
+    # the columns of SQLite are dynamically typed, so that queries combined with UNION ALL keep their types
+    name = "sqlite"
+
+    def get_column_types(self, table_name, connection):
+        schema = ""
+        if "." in table_name:
+            schema, table_name = table_name.split(".", 1)
+            schema = self.quote(schema) + "."
+        columns = pd.read_sql(f"PRAGMA {schema}table_info({self.quote(table_name)})", connection)
+        return dict(zip(columns["name"], columns["type"]))
+
+    def get_modification_marker(self, table_name, connection):
+        # changed whenever another connection commits a modification to the database
+        return list(pd.read_sql("PRAGMA data_version", connection)["data_version"])[0]
+
+    def get_cardinality_estimates(self, table_name, connection):
+        # ANALYZE only collects the statistics of indexes, in sqlite_stat1, so that the first column of each index
+        # has an estimate: the number of rows divided by the average number of rows per value of that column
+        schema = ""
+        if "." in table_name:
+            schema, table_name = table_name.split(".", 1)
+            schema = self.quote(schema) + "."
+        catalog = pd.read_sql(
+            f"SELECT name FROM {schema}sqlite_master WHERE name = 'sqlite_stat1'", connection
+        )
+        if catalog.empty:
+            return {}
+        stats = pd.read_sql(
+            f"SELECT idx, stat FROM {schema}sqlite_stat1 "
+            f"WHERE tbl = {self.literal(table_name)} AND idx IS NOT NULL",
+            connection,
+        )
+        estimates = {}
+        for index, stat in zip(stats["idx"], stats["stat"]):
+            counts = str(stat).split()
+            index_columns = pd.read_sql(f"PRAGMA {schema}index_info({self.quote(index)})", connection)
+            first = index_columns[index_columns["seqno"] == 0]["name"].tolist()
+            # the columns of expression indexes have no name
+            if len(counts) > 1 and first and first[0] is not None:
+                estimates[first[0]] = int(counts[0]) / max(int(counts[1]), 1)
+        return estimates
+
+    def get_type_category(self, sql_type):
+        # the declared types are classified with the rules that SQLite uses to determine their affinity
+        sql_type = str(sql_type).upper()
+        if "DATE" in sql_type or "TIME" in sql_type:
+            return "temporal"
+        elif "INT" in sql_type:
+            return "numeric"
+        elif "CHAR" in sql_type or "CLOB" in sql_type or "TEXT" in sql_type or "BOOL" in sql_type:
+            return "nominal"
+        elif "REAL" in sql_type or "FLOA" in sql_type or "DOUB" in sql_type:
+            return "numeric"
+        elif "NUMERIC" in sql_type or "DECIMAL" in sql_type:
+            return "numeric"
+        return None
+
+    def bucket(self, attribute, first, last, bin_size):
+        # the values are at least first, so that casting their offset to an integer rounds it down
+        attribute = self.quote(attribute)
+        first, last = float(first), float(last)
+        return (
+            f"CASE WHEN {attribute} >= {last!r} THEN {bin_size - 1} "
+            f"ELSE CAST(({attribute} - {first!r}) * {bin_size} / {last - first!r} AS INTEGER) END"
+        )
+
+
+DIALECTS = {"postgresql": PostgresDialect, "sqlite": SQLiteDialect}
+
+
+def get_dialect(connection):
+    """
+    Finds the dialect of the database of a connection: a sqlite3 connection, or a SQLAlchemy connectable or URL.
+    Postgres is assumed for other connections, such as those of psycopg2.
+    """
+    import sqlite3
+
+    if isinstance(connection, sqlite3.Connection):
+        return SQLiteDialect()
+    if isinstance(connection, str):
+        name = connection.split(":", 1)[0].split("+", 1)[0]
+    else:
+        name = getattr(getattr(connection, "dialect", None), "name", None)
+    return DIALECTS.get(name, PostgresDialect)()
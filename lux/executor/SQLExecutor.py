@@ -16,14 +16,21 @@ import pandas
 from lux.vis.VisList import VisList
 from lux.vis.Vis import Vis
 from lux.core.frame import LuxDataFrame
-from lux.executor.Executor import Executor
+from lux.executor.PandasExecutor import PandasExecutor
 from lux.utils import utils
+import lux
 import math
 
+# number of rows of the sample of a table that the scatter plots with more rows than that are computed on
+SCATTER_SAMPLE_SIZE = 10000
 
-class SQLExecutor(Executor):
+
+class SQLExecutor(PandasExecutor):
     """
     Given a Vis objects with complete specifications, fetch and process data using SQL operations.
+    The queries are written in the dialect of lux.config.SQLdialect, which is detected from lux.config.SQLconnection.
+    Dataframes that are not connected to a table with set_SQL_table, such as those read with pandas while
+    a table is explored, are processed by the PandasExecutor.
     """
 
     def __init__(self):
@@ -44,150 +51,306 @@ class SQLExecutor(Executor):
         1) Apply filters
         2) Retreive relevant attribute
         3) return a DataFrame with relevant results
+
+        The aggregates of the bar and line charts and histograms, and the number of rows of the other
+        visualizations, are queried together by execute_batch. The other visualizations with more than
+        SCATTER_SAMPLE_SIZE rows are computed on a sample of the table, which is kept until the table changes.
         """
+        if not ldf.table_name:
+            return PandasExecutor.execute(vislist, ldf)
+        dialect = lux.config.SQLdialect
+        queries = []
         for vis in vislist:
-            # Select relevant data based on attribute information
-            attributes = set([])
-            for clause in vis._inferred_intent:
-                if clause.attribute:
-                    if clause.attribute == "Record":
-                        attributes.add(clause.attribute)
-                    # else:
-                    attributes.add(clause.attribute)
-            if vis.mark not in ["bar", "line", "histogram"]:
+            if vis.mark == "bar" or vis.mark == "line":
+                query = SQLExecutor.get_aggregate_query(vis, ldf)
+            elif vis.mark == "histogram":
+                query = SQLExecutor.get_binning_query(vis, ldf)
+            else:
                 where_clause, filterVars = SQLExecutor.execute_filter(vis)
-                required_variables = attributes | set(filterVars)
-                required_variables = ",".join(required_variables)
-                row_count = list(
-                    pd.read_sql(
-                        f"SELECT COUNT(*) FROM {lux.config.table_name} {where_clause}",
-                        ldf.SQLconnection,
-                    )["count"]
-                )[0]
-                if row_count > 10000:
-                    query = f"SELECT {required_variables} FROM {lux.config.table_name} {where_clause} ORDER BY random() LIMIT 10000"
-                else:
-                    query = f"SELECT {required_variables} FROM {lux.config.table_name} {where_clause}"
-                data = pd.read_sql(query, ldf.SQLconnection)
-                vis._vis_data = utils.pandas_to_lux(data)
+                query = f"SELECT NULL AS batch_key, COUNT(*) AS batch_value FROM {ldf.table_name} {where_clause}"
+            if query is not None:
+                queries.append((vis, query))
+        if any(vis.mark not in ["bar", "line", "histogram"] for vis, _ in queries):
+            # the number of rows of the table tells whether its sample is still up to date
+            row_count_query = f"SELECT NULL AS batch_key, COUNT(*) AS batch_value FROM {ldf.table_name}"
+            queries.append((None, row_count_query))
+        results = SQLExecutor.execute_batch([query for _, query in queries])
+        table_row_count = None
+        if queries and queries[-1][0] is None:
+            table_row_count = int(list(results.pop()["batch_value"])[0])
+            queries.pop()
+        data_queries = []
+        sampled = []
+        for (vis, _), result in zip(queries, results):
             if vis.mark == "bar" or vis.mark == "line":
-                SQLExecutor.execute_aggregate(vis, ldf)
+                SQLExecutor.process_aggregate(vis, ldf, result)
             elif vis.mark == "histogram":
-                SQLExecutor.execute_binning(vis, ldf)
+                SQLExecutor.process_binning(vis, ldf, result)
+            else:
+                # Select relevant data based on attribute information
+                attributes = set([])
+                for clause in vis._inferred_intent:
+                    if clause.attribute and clause.attribute != "Record":
+                        attributes.add(clause.attribute)
+                where_clause, filterVars = SQLExecutor.execute_filter(vis)
+                required_variables = list(attributes | set(filterVars))
+                row_count = list(result["batch_value"])[0]
+                if row_count > SCATTER_SAMPLE_SIZE:
+                    sampled.append((vis, required_variables))
+                else:
+                    columns = ", ".join(dialect.quote(attr) for attr in required_variables)
+                    query = f"SELECT {columns} FROM {ldf.table_name} {where_clause}"
+                    data_queries.append((vis, query))
+        if sampled:
+            # the modification marker is retrieved once for all the visualizations computed on the sample
+            marker = dialect.get_modification_marker(ldf.table_name, lux.config.SQLconnection)
+            sample = SQLExecutor.get_sample(ldf, table_row_count, marker)
+            for vis, required_variables in sampled:
+                filters = utils.get_filter_specs(vis._inferred_intent)
+                vis._vis_data = utils.pandas_to_lux(
+                    PandasExecutor.apply_filters(sample, filters)[required_variables]
+                )
+        data = SQLExecutor.map_queries([query for _, query in data_queries])
+        for (vis, _), vis_data in zip(data_queries, data):
+            vis._vis_data = utils.pandas_to_lux(vis_data)
+
+    @staticmethod
+    def get_progressive_sample_sizes(ldf: LuxDataFrame):
+        # the visualizations of a SQL table are computed once over the whole table
+        if ldf.table_name:
+            return []
+        return PandasExecutor.get_progressive_sample_sizes(ldf)
+
+    @staticmethod
+    def get_sample(ldf: LuxDataFrame, row_count, marker):
+        """
+        Random sample of SCATTER_SAMPLE_SIZE rows of the table of a dataframe. The sample is queried once and
+        kept along with the number of rows of the table and its modification marker, and is queried again when
+        either of them changes.
+
+        Parameters
+        ----------
+        ldf : lux.core.frame
+            LuxDataFrame connected to a table with set_SQL_table
+        row_count : int
+            Current number of rows of the table
+        marker
+            Current modification marker of the table, as retrieved by SQLDialect.get_modification_marker
+
+        Returns
+        -------
+        sample: pd.DataFrame
+            Rows of the sample, with all the columns of the table
+        """
+        import pandas as pd
+
+        dialect = lux.config.SQLdialect
+        sample = ldf._SQL_sample
+        if sample is None or sample["row_count"] != row_count or sample["marker"] != marker:
+            order = dialect.random()
+            query = f"SELECT * FROM {ldf.table_name} ORDER BY {order} LIMIT {SCATTER_SAMPLE_SIZE}"
+            data = pd.read_sql(query, lux.config.SQLconnection)
+            ldf._SQL_sample = {"row_count": row_count, "marker": marker, "data": data}
+        return ldf._SQL_sample["data"]
+
+    @staticmethod
+    def execute_batch(queries):
+        """
+        Runs queries that each return a batch_key and a batch_value column, combining up to
+        lux.config.sql_batch_size of them with UNION ALL, so that they take a single round trip to the database.
+
+        Parameters
+        ----------
+        queries : list[str]
+            Queries to run
+
+        Returns
+        -------
+        results: list[pd.DataFrame]
+            The rows returned by each query, in the order of the queries
+        """
+        import numpy as np
+        import pandas as pd
+
+        dialect = lux.config.SQLdialect
+        batch_size = lux.config.sql_batch_size
+        batches = [queries[start : start + batch_size] for start in range(0, len(queries), batch_size)]
+        statements = []
+        for batch in batches:
+            if len(batch) == 1:
+                statements.append(batch[0])
+                continue
+            statements.append(
+                " UNION ALL ".join(
+                    f"SELECT {i} AS batch_index, {dialect.batch_key('batch_key')} AS batch_key, "
+                    f"{dialect.batch_value('batch_value')} AS batch_value FROM ({query}) AS batch_{i}"
+                    for i, query in enumerate(batch)
+                )
+            )
+        results = []
+        for batch, data in zip(batches, SQLExecutor.map_queries(statements)):
+            if len(batch) == 1:
+                results.append(data)
+                continue
+            # the rows of each query are demultiplexed by the index of the query that they belong to
+            indices = data.groupby("batch_index").indices
+            empty = np.array([], dtype=np.intp)
+            for i in range(len(batch)):
+                rows = data.take(indices.get(i, empty))[["batch_key", "batch_value"]]
+                results.append(rows.reset_index(drop=True))
+        return results
+
+    @staticmethod
+    def map_queries(queries):
+        """
+        Runs each of the queries. When lux.config.set_SQL_connection_factory has been called, independent
+        queries are run concurrently on up to lux.config.num_workers connections created by the factory.
+
+        Parameters
+        ----------
+        queries : list[str]
+            Queries to run
+
+        Returns
+        -------
+        results: list[pd.DataFrame]
+            Rows returned by each query, in the same order as queries
+        """
+        import pandas as pd
+
+        queries = list(queries)
+        factory = lux.config.SQLconnection_factory
+        num_workers = min(lux.config.num_workers, len(queries))
+        if factory is None or num_workers <= 1:
+            return [pd.read_sql(query, lux.config.SQLconnection) for query in queries]
+        from concurrent.futures import ThreadPoolExecutor
+
+        def read_sql(query):
+            # connections are not shared across threads, so each query runs on its own connection
+            connection = factory()
+            try:
+                return pd.read_sql(query, connection)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            return list(pool.map(read_sql, queries))
+
+    @staticmethod
+    def get_aggregate_query(vis: Vis, ldf: LuxDataFrame):
+        """
+        Query of the aggregated data of a bar or line chart, or None if it is not aggregated.
+        """
+        aggregate_attrs = PandasExecutor.get_aggregate_attrs(vis)
+        if aggregate_attrs is None:
+            return None
+        groupby_attr, measure_attr, agg_func, _ = aggregate_attrs
+        quote = lux.config.SQLdialect.quote
+        groupby = quote(groupby_attr.attribute)
+        where_clause, filterVars = SQLExecutor.execute_filter(vis)
+        # barchart case, need count data for each group
+        if measure_attr.attribute == "Record":
+            aggregate = "COUNT(*)"
+        else:
+            sql_functions = {"mean": "AVG", "sum": "SUM", "max": "MAX", "min": "MIN", "count": "COUNT"}
+            if agg_func not in sql_functions:
+                return None
+            aggregate = f"{sql_functions[agg_func]}({quote(measure_attr.attribute)})"
+        return f"SELECT {groupby} AS batch_key, {aggregate} AS batch_value FROM {ldf.table_name} {where_clause} GROUP BY {groupby}"
 
     @staticmethod
     def execute_aggregate(vis: Vis, ldf: LuxDataFrame):
         import pandas as pd
 
-        x_attr = vis.get_attr_by_channel("x")[0]
-        y_attr = vis.get_attr_by_channel("y")[0]
-        groupby_attr = ""
-        measure_attr = ""
-        if y_attr.aggregation != "":
-            groupby_attr = x_attr
-            measure_attr = y_attr
-            agg_func = y_attr.aggregation
-        if x_attr.aggregation != "":
-            groupby_attr = y_attr
-            measure_attr = x_attr
-            agg_func = x_attr.aggregation
-
-        if measure_attr != "":
-            # barchart case, need count data for each group
-            if measure_attr.attribute == "Record":
-                where_clause, filterVars = SQLExecutor.execute_filter(vis)
-                count_query = f"SELECT {groupby_attr.attribute}, COUNT({groupby_attr.attribute}) FROM {lux.config.table_name} {where_clause} GROUP BY {groupby_attr.attribute}"
-                vis._vis_data = pd.read_sql(count_query, ldf.SQLconnection)
-                vis._vis_data = vis.data.rename(columns={"count": "Record"})
-                vis._vis_data = utils.pandas_to_lux(vis.data)
+        query = SQLExecutor.get_aggregate_query(vis, ldf)
+        if query is not None:
+            SQLExecutor.process_aggregate(vis, ldf, pd.read_sql(query, lux.config.SQLconnection))
 
-            else:
-                where_clause, filterVars = SQLExecutor.execute_filter(vis)
-                if agg_func == "mean":
-                    mean_query = f"SELECT {groupby_attr.attribute}, AVG({measure_attr.attribute}) as {measure_attr.attribute} FROM {lux.config.table_name} {where_clause} GROUP BY {groupby_attr.attribute}"
-                    vis._vis_data = pd.read_sql(mean_query, ldf.SQLconnection)
-                    vis._vis_data = utils.pandas_to_lux(vis.data)
-                if agg_func == "sum":
-                    mean_query = f"SELECT {groupby_attr.attribute}, SUM({measure_attr.attribute}) as {measure_attr.attribute} FROM {lux.config.table_name} {where_clause} GROUP BY {groupby_attr.attribute}"
-                    vis._vis_data = pd.read_sql(mean_query, ldf.SQLconnection)
-                    vis._vis_data = utils.pandas_to_lux(vis.data)
-                if agg_func == "max":
-                    mean_query = f"SELECT {groupby_attr.attribute}, MAX({measure_attr.attribute}) as {measure_attr.attribute} FROM {lux.config.table_name} {where_clause} GROUP BY {groupby_attr.attribute}"
-                    vis._vis_data = pd.read_sql(mean_query, ldf.SQLconnection)
-                    vis._vis_data = utils.pandas_to_lux(vis.data)
-
-            # pad empty categories with 0 counts after filter is applied
-            all_attr_vals = ldf.unique_values[groupby_attr.attribute]
-            result_vals = list(vis.data[groupby_attr.attribute])
-            if len(result_vals) != len(all_attr_vals):
-                # For filtered aggregation that have missing groupby-attribute values, set these aggregated value as 0, since no datapoints
-                for vals in all_attr_vals:
-                    if vals not in result_vals:
-                        vis.data.loc[len(vis.data)] = [vals] + [0] * (len(vis.data.columns) - 1)
+    @staticmethod
+    def process_aggregate(vis: Vis, ldf: LuxDataFrame, result):
+        groupby_attr, measure_attr, _, _ = PandasExecutor.get_aggregate_attrs(vis)
+        keys = lux.config.SQLdialect.decode_keys(
+            list(result["batch_key"]), ldf.unique_values[groupby_attr.attribute]
+        )
+        values = list(result["batch_value"])
+        if measure_attr.attribute == "Record":
+            values = [int(value) for value in values]
+        vis._vis_data = utils.pandas_to_lux(
+            pandas.DataFrame({groupby_attr.attribute: keys, measure_attr.attribute: values})
+        )
+
+        # pad empty categories with 0 counts after filter is applied
+        all_attr_vals = ldf.unique_values[groupby_attr.attribute]
+        result_vals = list(vis.data[groupby_attr.attribute])
+        # only some of the values of columns with a very high cardinality are known
+        if len(result_vals) != len(all_attr_vals) and not utils.unique_values_truncated(
+            ldf, groupby_attr.attribute
+        ):
+            # For filtered aggregation that have missing groupby-attribute values, set these aggregated value as 0, since no datapoints
+            for vals in all_attr_vals:
+                if vals not in result_vals:
+                    vis.data.loc[len(vis.data)] = [vals] + [0] * (len(vis.data.columns) - 1)
+
+    @staticmethod
+    def get_binning_query(vis: Vis, ldf: LuxDataFrame):
+        """
+        Query of the number of values in each bin of a histogram, or None if its attribute has no values.
+        """
+        bin_attribute = list(filter(lambda x: x.bin_size != 0, vis._inferred_intent))[0]
+        bin_range = SQLExecutor.get_bin_range(bin_attribute.attribute, ldf)
+        if bin_range is None:
+            return None
+        bucket = lux.config.SQLdialect.bucket(
+            bin_attribute.attribute, *bin_range, bin_attribute.bin_size
+        )
+        where_clause, filter_vars = SQLExecutor.execute_filter(vis)
+        not_null = f"{lux.config.SQLdialect.quote(bin_attribute.attribute)} IS NOT NULL"
+        where_clause = f"{where_clause} AND {not_null}" if where_clause else f"WHERE {not_null}"
+        return f"SELECT {bucket} AS batch_key, COUNT(*) AS batch_value FROM {ldf.table_name} {where_clause} GROUP BY {bucket}"
+
+    @staticmethod
+    def get_bin_range(attr, ldf: LuxDataFrame):
+        if attr not in ldf._min_max:
+            return None
+        attr_min, attr_max = ldf._min_max[attr]
+        if attr_min == attr_max:
+            # the bins are centered on the only value, as np.histogram does
+            attr_min, attr_max = attr_min - 0.5, attr_max + 0.5
+        return attr_min, attr_max
 
     @staticmethod
     def execute_binning(vis: Vis, ldf: LuxDataFrame):
+        import pandas as pd
+
+        query = SQLExecutor.get_binning_query(vis, ldf)
+        if query is not None:
+            SQLExecutor.process_binning(vis, ldf, pd.read_sql(query, lux.config.SQLconnection))
+
+    @staticmethod
+    def process_binning(vis: Vis, ldf: LuxDataFrame, result):
         import numpy as np
         import pandas as pd
 
         bin_attribute = list(filter(lambda x: x.bin_size != 0, vis._inferred_intent))[0]
-        if not math.isnan(vis.data.min_max[bin_attribute.attribute][0]) and math.isnan(
-            vis.data.min_max[bin_attribute.attribute][1]
-        ):
-            num_bins = bin_attribute.bin_size
-            attr_min = min(ldf.unique_values[bin_attribute.attribute])
-            attr_max = max(ldf.unique_values[bin_attribute.attribute])
-            attr_type = type(ldf.unique_values[bin_attribute.attribute][0])
-
-            # need to calculate the bin edges before querying for the relevant data
-            bin_width = (attr_max - attr_min) / num_bins
-            upper_edges = []
-            for e in range(1, num_bins):
-                curr_edge = attr_min + e * bin_width
-                if attr_type == int:
-                    upper_edges.append(str(math.ceil(curr_edge)))
-                else:
-                    upper_edges.append(str(curr_edge))
-            upper_edges = ",".join(upper_edges)
-            vis_filter, filter_vars = SQLExecutor.execute_filter(vis)
-            bin_count_query = f"SELECT width_bucket, COUNT(width_bucket) FROM (SELECT width_bucket({bin_attribute.attribute}, '{{{upper_edges}}}') FROM {lux.config.table_name}) as Buckets GROUP BY width_bucket ORDER BY width_bucket"
-            bin_count_data = pd.read_sql(bin_count_query, ldf.SQLconnection)
-
-            # counts,binEdges = np.histogram(ldf[bin_attribute.attribute],bins=bin_attribute.bin_size)
-            # binEdges of size N+1, so need to compute binCenter as the bin location
-            upper_edges = [float(i) for i in upper_edges.split(",")]
-            if attr_type == int:
-                bin_centers = np.array([math.ceil((attr_min + attr_min + bin_width) / 2)])
-            else:
-                bin_centers = np.array([(attr_min + attr_min + bin_width) / 2])
-            bin_centers = np.append(
-                bin_centers,
-                np.mean(np.vstack([upper_edges[0:-1], upper_edges[1:]]), axis=0),
-            )
-            if attr_type == int:
-                bin_centers = np.append(
-                    bin_centers,
-                    math.ceil((upper_edges[len(upper_edges) - 1] + attr_max) / 2),
-                )
-            else:
-                bin_centers = np.append(bin_centers, (upper_edges[len(upper_edges) - 1] + attr_max) / 2)
-
-            if len(bin_centers) > len(bin_count_data):
-                bucket_lables = bin_count_data["width_bucket"].unique()
-                for i in range(0, len(bin_centers)):
-                    if i not in bucket_lables:
-                        bin_count_data = bin_count_data.append(
-                            pd.DataFrame([[i, 0]], columns=bin_count_data.columns)
-                        )
-            vis._vis_data = pd.DataFrame(
-                np.array([bin_centers, list(bin_count_data["count"])]).T,
-                columns=[bin_attribute.attribute, "Number of Records"],
-            )
-            vis._vis_data = utils.pandas_to_lux(vis.data)
+        attr = bin_attribute.attribute
+        num_bins = bin_attribute.bin_size
+        attr_min, attr_max = SQLExecutor.get_bin_range(attr, ldf)
+        # buckets without any value are missing from the result, and have a count of 0
+        counts = np.zeros(num_bins)
+        counts[np.asarray(result["batch_key"], dtype=float).astype(int)] = result["batch_value"]
+        # bin_edges of size N+1, so need to compute bin_center as the bin location
+        bin_edges = np.linspace(attr_min, attr_max, num_bins + 1)
+        bin_centers = np.mean(np.vstack([bin_edges[0:-1], bin_edges[1:]]), axis=0)
+        vis._vis_data = pd.DataFrame(
+            np.array([bin_centers, counts]).T,
+            columns=[attr, "Number of Records"],
+        )
+        vis._vis_data = utils.pandas_to_lux(vis.data)
 
     @staticmethod
     # takes in a vis and returns an appropriate SQL WHERE clause that based on the filters specified in the vis's _inferred_intent
     def execute_filter(vis: Vis):
+        dialect = lux.config.SQLdialect
         where_clause = []
         filters = utils.get_filter_specs(vis._inferred_intent)
         filter_vars = []
@@ -197,13 +360,14 @@ class SQLExecutor(Executor):
                     where_clause.append("WHERE")
                 else:
                     where_clause.append("AND")
-                where_clause.extend(
-                    [
-                        str(filters[f].attribute),
-                        str(filters[f].filter_op),
-                        "'" + str(filters[f].value) + "'",
-                    ]
-                )
+                attribute = dialect.quote(filters[f].attribute)
+                if utils.like_nan(filters[f].value) and filters[f].filter_op in ["=", "!="]:
+                    null_check = "IS NULL" if filters[f].filter_op == "=" else "IS NOT NULL"
+                    where_clause.extend([attribute, null_check])
+                else:
+                    where_clause.extend(
+                        [attribute, str(filters[f].filter_op), dialect.literal(filters[f].value)]
+                    )
                 if filters[f].attribute not in filter_vars:
                     filter_vars.append(filters[f].attribute)
         if where_clause == []:
@@ -0,0 +1,485 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import pandas as pd
+from lux.vis.VisList import VisList
+from lux.vis.Vis import Vis
+from lux.core.frame import LuxDataFrame
+from lux.executor.PandasExecutor import PandasExecutor
+from lux.utils import utils
+import warnings
+import lux
+
+# number of rows of the file read at once
+STREAM_CHUNK_SIZE = 10 ** 6
+# number of smallest hashes of the values of each column kept to estimate the cardinality of the
+# columns whose unique values do not fit in lux.config.unique_values_cap
+CARDINALITY_SKETCH_SIZE = 2 ** 12
+# partial aggregates of each chunk needed by the aggregation functions computed over the whole file
+STREAM_AGGREGATES = {
+    "mean": ["sum", "count"],
+    "sum": ["sum"],
+    "count": ["count"],
+    "min": ["min"],
+    "max": ["max"],
+}
+
+
+def read_stream(path, chunksize=STREAM_CHUNK_SIZE, **read_options):
+    """
+    Loads a CSV or Parquet file that may not fit in memory, and sets the executor to a StreamingExecutor
+    that computes the visualizations of the returned dataframe over the whole file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file, read as Parquet if it ends with .parquet or .pq, and as CSV otherwise
+    chunksize : int
+        Number of rows of the file read at once
+    read_options
+        Keyword arguments passed to pd.read_csv
+
+    Returns
+    -------
+    ldf: LuxDataFrame
+        Random sample of at most lux.config.sampling_cap rows of the file
+    """
+    if not isinstance(lux.config.executor, StreamingExecutor):
+        lux.config.executor = StreamingExecutor()
+    return StreamingExecutor.load(path, chunksize, **read_options)
+
+
+class StreamingExecutor(PandasExecutor):
+    """
+    Given a Vis objects with complete specifications, fetch and process data by streaming a file in chunks.
+
+    Only a random sample of the file is loaded in the dataframe. The metadata, bar and line charts and
+    histograms of the dataframe are computed over the whole file, by merging the partial aggregates of
+    each chunk, while the other visualizations are computed over the sample. Dataframes that were not
+    loaded with read_stream, or whose data was modified since, are processed like a PandasExecutor does.
+    """
+
+    def __init__(self):
+        self.name = "StreamingExecutor"
+        warnings.formatwarning = lux.warning_format
+
+    def __repr__(self):
+        return f"<StreamingExecutor>"
+
+    @staticmethod
+    def is_streamed(ldf: LuxDataFrame):
+        return ldf._stream_source is not None
+
+    @staticmethod
+    def load(path, chunksize=STREAM_CHUNK_SIZE, **read_options):
+        """
+        Reads a file in chunks to draw a uniform random sample of its rows and compute the statistics
+        of its columns, in a single pass.
+
+        The sample is drawn by giving a random key to each row and keeping the lux.config.sampling_cap rows
+        with the smallest keys, in the order of the file. The rows are indexed by their position in the file.
+        """
+        import numpy as np
+
+        file_format = "parquet" if str(path).endswith((".parquet", ".pq")) else "csv"
+        source = {
+            "path": path,
+            "format": file_format,
+            "chunksize": chunksize,
+            "read_options": read_options,
+        }
+        cap = lux.config.sampling_cap
+        random_state = np.random.RandomState(1)
+        sample = None
+        sample_keys = None
+        stats = {}
+        num_rows = 0
+        for chunk in StreamingExecutor.iter_chunks(source):
+            chunk.index = pd.RangeIndex(num_rows, num_rows + len(chunk))
+            num_rows += len(chunk)
+            StreamingExecutor.update_stream_stats(stats, chunk)
+            keys = random_state.random_sample(len(chunk))
+            if sample is not None and len(sample) >= cap:
+                # only the rows with a smaller key than a row of the sample can replace it
+                selected = keys < sample_keys.max()
+                chunk = chunk[selected]
+                keys = keys[selected]
+            if sample is None:
+                sample, sample_keys = chunk, keys
+            else:
+                sample = pd.concat([sample, chunk])
+                sample_keys = np.concatenate([sample_keys, keys])
+            if len(sample) > cap:
+                kept = np.sort(np.argpartition(sample_keys, cap - 1)[:cap])
+                sample = sample.iloc[kept]
+                sample_keys = sample_keys[kept]
+        ldf = LuxDataFrame(sample) if sample is not None else LuxDataFrame()
+        source["num_rows"] = num_rows
+        source["stats"] = StreamingExecutor.finalize_stream_stats(stats)
+        ldf._stream_source = source
+        return ldf
+
+    @staticmethod
+    def iter_chunks(source, columns=None, dtype=None):
+        """
+        Reads the given columns of the file one chunk of rows at a time.
+
+        Parameters
+        ----------
+        source : dict
+            File that the dataframe was loaded from, as stored in its _stream_source
+        columns : list, optional
+            Columns to read, by default all of them
+        dtype : dict, optional
+            Data types of the columns of a CSV file, so that they are parsed consistently across chunks
+        """
+        if source["format"] == "parquet":
+            try:
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError(
+                    "pyarrow is not installed. Run `pip install pyarrow' to install pyarrow to stream Parquet files."
+                )
+            parquet_file = pq.ParquetFile(source["path"])
+            for batch in parquet_file.iter_batches(batch_size=source["chunksize"], columns=columns):
+                yield LuxDataFrame(batch.to_pandas())
+        else:
+            read_options = dict(source["read_options"])
+            if columns is not None:
+                read_options["usecols"] = columns
+            if dtype:
+                read_options["dtype"] = {**dtype, **(read_options.get("dtype") or {})}
+            for chunk in pd.read_csv(source["path"], chunksize=source["chunksize"], **read_options):
+                yield chunk
+
+    @staticmethod
+    def update_stream_stats(stats, chunk: pd.DataFrame):
+        """
+        Merges the statistics of the columns of a chunk into those of the previous chunks: the number of
+        occurrences of their values (keeping the lux.config.unique_values_cap most frequent values), their
+        number of missing values, their min/max and the smallest hashes of their values.
+        """
+        import numpy as np
+
+        cap = lux.config.unique_values_cap
+        for attr in chunk.columns:
+            series = chunk[attr]
+            state = stats.setdefault(
+                attr,
+                {
+                    "value_counts": None,
+                    "null_count": 0,
+                    "truncated": False,
+                    "numeric": True,
+                    "integral": True,
+                    "min_max": None,
+                    "sketch": np.array([], dtype=np.uint64),
+                },
+            )
+            values = series.dropna()
+            state["null_count"] += len(series) - len(values)
+            counts = values.value_counts(sort=False)
+            if state["value_counts"] is not None:
+                counts = pd.concat([state["value_counts"], counts]).groupby(level=0, sort=False).sum()
+            if cap is not None and len(counts) > cap:
+                # the values pruned from a chunk may occur again, so the kept counts are approximate
+                state["truncated"] = True
+                counts = counts.nlargest(cap)
+            state["value_counts"] = counts
+
+            dtype = series.dtype
+            numeric = pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+            state["numeric"] = state["numeric"] and numeric
+            if state["numeric"] and len(values) > 0:
+                chunk_min, chunk_max = values.min(), values.max()
+                if state["min_max"] is not None:
+                    chunk_min = min(chunk_min, state["min_max"][0])
+                    chunk_max = max(chunk_max, state["min_max"][1])
+                state["min_max"] = (chunk_min, chunk_max)
+            if pd.api.types.is_float_dtype(dtype):
+                vals = values.to_numpy(dtype=float)
+                state["integral"] = bool(
+                    state["integral"]
+                    and np.isfinite(vals).all()
+                    and (np.abs(vals) < 2 ** 63).all()
+                    and (vals == np.floor(vals)).all()
+                )
+            # numbers are hashed as floats, since the same column may be parsed as integers in some chunks
+            hashed = values.astype("float64") if numeric else values
+            hashes = pd.util.hash_pandas_object(hashed, index=False).to_numpy()
+            if len(hashes) > CARDINALITY_SKETCH_SIZE:
+                hashes = np.partition(hashes, CARDINALITY_SKETCH_SIZE - 1)[:CARDINALITY_SKETCH_SIZE]
+            sketch = np.unique(np.concatenate([state["sketch"], hashes]))
+            state["sketch"] = sketch[:CARDINALITY_SKETCH_SIZE]
+
+    @staticmethod
+    def finalize_stream_stats(stats):
+        """
+        Converts the statistics of the columns of a file into profiles like those of compute_column_profile.
+        The cardinality of the columns whose values were truncated is estimated from the k-th smallest hash
+        of their values (k-minimum values sketch), and is exact otherwise.
+        """
+        import numpy as np
+
+        TOPK_VALUES = 100
+        profiles = {}
+        for attr, state in stats.items():
+            counts = state["value_counts"]
+            null_count = state["null_count"]
+            if state["truncated"]:
+                top = counts.nlargest(min(TOPK_VALUES, len(counts)))
+                unique_values = list(top.index)
+                value_counts = top.tolist()
+                sketch = state["sketch"]
+                cardinality = len(counts)
+                if len(sketch) == CARDINALITY_SKETCH_SIZE:
+                    kth_hash = (float(sketch[-1]) + 1) / 2 ** 64
+                    cardinality = max(cardinality, int(round((CARDINALITY_SKETCH_SIZE - 1) / kth_hash)))
+            else:
+                unique_values = list(counts.index)
+                value_counts = counts.tolist()
+                cardinality = len(counts)
+                if null_count > 0:
+                    unique_values.append(np.nan)
+                    value_counts.append(null_count)
+            if null_count > 0:
+                cardinality += 1
+            profiles[attr] = {
+                "unique_values": unique_values,
+                "value_counts": value_counts,
+                "cardinality": cardinality,
+                "null_count": null_count,
+                "truncated": state["truncated"],
+                "min_max": state["min_max"] if state["numeric"] else None,
+                "integral": state["integral"],
+            }
+        return profiles
+
+    def compute_dataset_metadata(self, ldf: LuxDataFrame):
+        # the data types are inferred from the sample, whose cardinalities are relative to its number of rows
+        super().compute_dataset_metadata(ldf)
+        if self.is_streamed(ldf):
+            self.apply_stream_stats(ldf)
+
+    @staticmethod
+    def apply_stream_stats(ldf: LuxDataFrame):
+        """
+        Replaces the statistics of the columns computed over the sample with those of the whole file.
+        """
+        ldf.unique_values = dict(ldf.unique_values)
+        ldf._min_max = dict(ldf._min_max)
+        ldf.cardinality = dict(ldf.cardinality)
+        ldf._column_profile = dict(ldf._column_profile)
+        for attr, profile in ldf._stream_source["stats"].items():
+            if attr not in ldf.unique_values:
+                continue
+            profile = dict(profile)
+            ldf.unique_values[attr] = profile.pop("unique_values")
+            ldf.cardinality[attr] = profile.pop("cardinality")
+            min_max = profile.pop("min_max")
+            if min_max is not None:
+                ldf._min_max[attr] = min_max
+            ldf._column_profile[attr] = profile
+
+    @staticmethod
+    def execute(vislist: VisList, ldf: LuxDataFrame):
+        """
+        Given a VisList, fetch the data required to render the vis.
+        The bar and line charts and histograms are computed over the whole file in a single pass over its
+        chunks, and the other visualizations are computed over the sample by PandasExecutor.execute.
+
+        Parameters
+        ----------
+        vislist: list[lux.Vis]
+            vis list that contains lux.Vis objects for visualization.
+        ldf : lux.core.frame
+            LuxDataFrame with specified intent.
+
+        Returns
+        -------
+        None
+        """
+        if not StreamingExecutor.is_streamed(ldf):
+            return PandasExecutor.execute(vislist, ldf)
+        PandasExecutor.execute_sampling(ldf)
+        plans = []
+        for vis in vislist:
+            result = ldf._get_vis_result(vis)
+            if result is not None and "data" in result:
+                continue
+            plan = StreamingExecutor.get_stream_plan(vis, ldf)
+            if plan is not None:
+                plans.append((vis, plan))
+        if plans:
+            StreamingExecutor.execute_stream(plans, ldf)
+        streamed = set(id(vis) for vis, _ in plans)
+        unstreamed = [vis for vis in vislist if id(vis) not in streamed]
+        if unstreamed:
+            PandasExecutor.execute(unstreamed, ldf)
+            if len(ldf) < ldf._stream_source["num_rows"]:
+                ldf._message.add_unique(
+                    f"Large file detected: Lux is visualizing bar charts and histograms over all "
+                    f"{ldf._stream_source['num_rows']} rows of the file, and the other charts over a random "
+                    f"sample of {len(ldf)} rows.",
+                    priority=99,
+                )
+
+    @staticmethod
+    def get_stream_plan(vis: Vis, ldf: LuxDataFrame):
+        """
+        Finds how the data of a vis is aggregated over the chunks of the file.
+
+        Returns
+        -------
+        plan: Optional[dict]
+            The columns read, the filters applied and either the group-by keys, measure and partial aggregates
+            of a bar or line chart, or the attribute, range and number of bins of a histogram, or None if the
+            vis is computed over the sample
+        """
+        import numpy as np
+
+        stats = ldf._stream_source["stats"]
+        filters = utils.get_filter_specs(vis._inferred_intent)
+        filter_attrs = [clause.attribute for clause in filters]
+        if vis.mark == "bar" or vis.mark == "line":
+            aggregate_attrs = PandasExecutor.get_aggregate_attrs(vis)
+            if aggregate_attrs is None:
+                return None
+            groupby_attr, measure_attr, agg_func, color_attr = aggregate_attrs
+            keys = [groupby_attr.attribute]
+            if color_attr is not None:
+                keys.append(color_attr.attribute)
+            measure = measure_attr.attribute
+            if measure == "Record":
+                aggregates = ["size"]
+                measure_columns = []
+            elif agg_func in STREAM_AGGREGATES and stats.get(measure, {}).get("min_max") is not None:
+                # only the numeric columns have a min/max in the statistics of the file
+                aggregates = STREAM_AGGREGATES[agg_func]
+                measure_columns = [measure]
+            else:
+                return None
+            plan = {"keys": keys, "measure": measure, "agg_func": agg_func, "aggregates": aggregates}
+            columns = keys + measure_columns + filter_attrs
+        elif vis.mark == "histogram":
+            bin_attribute = list(filter(lambda x: x.bin_size != 0, vis._inferred_intent))[0]
+            attr = bin_attribute.attribute
+            min_max = stats.get(attr, {}).get("min_max")
+            if min_max is None or not np.isfinite(min_max).all():
+                return None
+            # the bins span the values of the whole file, also when the histogram is filtered
+            plan = {"attribute": attr, "range": min_max, "bin_size": bin_attribute.bin_size}
+            columns = [attr] + filter_attrs
+        else:
+            return None
+        if any(attr not in stats for attr in columns):
+            return None
+        plan["columns"] = columns
+        plan["filters"] = filters
+        return plan
+
+    @staticmethod
+    def execute_stream(plans, ldf: LuxDataFrame):
+        """
+        Reads the columns needed by the given visualizations in a single pass over the file, and merges the
+        partial aggregates of each chunk. The data of each vis is then processed like the data aggregated
+        over a dataframe, so that it has the same shape as with a PandasExecutor.
+
+        Parameters
+        ----------
+        plans : list[tuple]
+            Each vis and its plan, as found by get_stream_plan
+        ldf : lux.core.frame
+            LuxDataFrame loaded with read_stream
+        """
+        import numpy as np
+
+        needed = set(attr for _, plan in plans for attr in plan["columns"])
+        columns = [attr for attr in ldf.columns if attr in needed]
+        # columns of strings are parsed as such in every chunk, even if some chunks only contain numbers
+        dtype = {attr: object for attr in columns if ldf.dtypes[attr] == object}
+        partials = [None] * len(plans)
+        for chunk in StreamingExecutor.iter_chunks(ldf._stream_source, columns, dtype):
+            for i, (vis, plan) in enumerate(plans):
+                data = chunk
+                if plan["filters"]:
+                    # the bitmaps of the filters are cached on the chunk, so they are shared across visualizations
+                    data = PandasExecutor.apply_filters(chunk, plan["filters"])
+                if "keys" in plan:
+                    partial = StreamingExecutor.get_partial_aggregate(data, plan)
+                    if partials[i] is not None:
+                        partial = StreamingExecutor.merge_partial_aggregates(partials[i], partial, plan)
+                else:
+                    first, last = plan["range"]
+                    partial, _ = PandasExecutor.execute_block_binning(
+                        [data[plan["attribute"]].to_numpy(dtype="float64")],
+                        np.array([first], dtype="float64"),
+                        np.array([last], dtype="float64"),
+                        plan["bin_size"],
+                    )
+                    if partials[i] is not None:
+                        partial = partials[i] + partial
+                partials[i] = partial
+
+        for (vis, plan), partial in zip(plans, partials):
+            if "keys" in plan:
+                if partial is None:
+                    partial = StreamingExecutor.get_partial_aggregate(ldf.iloc[:0], plan)
+                measure = plan["measure"]
+                if plan["aggregates"] == ["size"]:
+                    values = partial["size"]
+                elif plan["agg_func"] == "mean":
+                    values = partial["sum"] / partial["count"]
+                else:
+                    values = partial[plan["agg_func"]]
+                groupby_result = values.rename(measure).reset_index().__finalize__(ldf)
+                # the unique values of the group-by attributes are read from the metadata of the file
+                vis._vis_data = ldf._sampled
+                PandasExecutor.execute_aggregate(
+                    vis, isFiltered=len(plan["filters"]) > 0, groupby_result=groupby_result
+                )
+            else:
+                first, last = plan["range"]
+                counts, bin_edges = PandasExecutor.execute_block_binning(
+                    [np.array([], dtype="float64")],
+                    np.array([first], dtype="float64"),
+                    np.array([last], dtype="float64"),
+                    plan["bin_size"],
+                )
+                if partial is not None:
+                    counts = partial
+                attr = plan["attribute"]
+                # bin_edges of size N+1, so need to compute bin_center as the bin location
+                bin_center = np.mean(np.vstack([bin_edges[0][0:-1], bin_edges[0][1:]]), axis=0)
+                binned_result = np.array([bin_center, counts[0]]).T
+                vis._vis_data = pd.DataFrame(binned_result, columns=[attr, "Number of Records"])
+            ldf._save_vis_result(vis, data=vis.data.copy())
+
+    @staticmethod
+    def get_partial_aggregate(data: pd.DataFrame, plan: dict):
+        if plan["aggregates"] == ["size"]:
+            # the rows are counted as a column of ones, since pandas' groupby size does not build LuxSeries
+            ones = data[plan["keys"]].assign(Record=1)
+            counts = ones.groupby(plan["keys"], dropna=False, sort=False)["Record"].sum()
+            return counts.to_frame("size")
+        grouped = data.groupby(plan["keys"], dropna=False, sort=False)
+        return grouped[plan["measure"]].agg(plan["aggregates"])
+
+    @staticmethod
+    def merge_partial_aggregates(partial: pd.DataFrame, other: pd.DataFrame, plan: dict):
+        merge_funcs = {"size": "sum", "sum": "sum", "count": "sum", "min": "min", "max": "max"}
+        merged = pd.concat([partial, other])
+        levels = list(range(len(plan["keys"])))
+        grouped = merged.groupby(level=levels, dropna=False, sort=False)
+        return grouped.agg({aggregate: merge_funcs[aggregate] for aggregate in plan["aggregates"]})
@@ -43,7 +43,31 @@ def interestingness(vis: Vis, ldf: LuxDataFrame) -> int:
     int
             Interestingness Score
     """
+    if compares_to_current_vis(ldf):
+        # the score depends on the intent of the dataframe, which the saved results do not account for
+        return _interestingness(vis, ldf)
+    # Reuse the score of a vis with the same intent, if its columns have not been modified since
+    result = ldf._get_vis_result(vis)
+    if result is not None and "score" in result:
+        return result["score"]
+    score = _interestingness(vis, ldf)
+    ldf._save_vis_result(vis, score=score)
+    return score
+
+
+def compares_to_current_vis(ldf: LuxDataFrame) -> bool:
+    """
+    Whether the visualizations are scored by their similarity to the current (filtered line chart) vis.
+    """
+    return (
+        ldf.current_vis is not None
+        and len(ldf.current_vis) == 1
+        and ldf.current_vis[0].mark == "line"
+        and len(get_filter_specs(ldf.intent)) > 0
+    )
 
+
+def _interestingness(vis: Vis, ldf: LuxDataFrame) -> int:
     if vis.data is None or len(vis.data) == 0:
         return -1
         # raise Exception("Vis.data needs to be populated before interestingness can be computed. Run Executor.execute(vis,ldf).")
@@ -61,11 +85,8 @@ def interestingness(vis: Vis, ldf: LuxDataFrame) -> int:
         if (
             n_dim == 1
             and (n_msr == 0 or n_msr == 1)
-            and ldf.current_vis is not None
             and vis.get_attr_by_channel("y")[0].data_type == "quantitative"
-            and len(ldf.current_vis) == 1
-            and ldf.current_vis[0].mark == "line"
-            and len(get_filter_specs(ldf.intent)) > 0
+            and compares_to_current_vis(ldf)
         ):
             query_vc = VisList(ldf.current_vis, ldf)
             query_vis = query_vc[0]
@@ -171,11 +192,8 @@ def interestingness(vis: Vis, ldf: LuxDataFrame) -> int:
 
 
 def get_filtered_size(filter_specs, ldf):
-    filter_intents = filter_specs[0]
-    result = PandasExecutor.apply_filter(
-        ldf, filter_intents.attribute, filter_intents.filter_op, filter_intents.value
-    )
-    return len(result)
+    # the rows are counted on the cached bitmap of the filter, without selecting them from the dataframe
+    return int(PandasExecutor.get_filter_mask(ldf, filter_specs[:1]).sum())
 
 
 def skewness(v):
@@ -236,19 +254,14 @@ def deviation_from_overall(
     v_filter = v_filter / total  # normalize by total to get ratio
     if total == 0:
         return 0
-    # Generate an "Overall" Vis (TODO: This is computed multiple times for every vis, alternative is to directly access df.current_vis but we do not have guaruntee that will always be unfiltered vis (in the non-Filter action scenario))
-    import copy
-
-    unfiltered_vis = copy.copy(vis)
-    # Remove filters, keep only attribute intent
-    unfiltered_vis._inferred_intent = utils.get_attrs_specs(vis._inferred_intent)
-    lux.config.executor.execute([unfiltered_vis], ldf)
-    if exclude_nan:
-        uv = unfiltered_vis.data.dropna()
-    else:
-        uv = unfiltered_vis.data
-    v = uv[msr_attribute]
-    v = v / v.sum()
+    uv, v, v_rank = get_overall_baseline(vis, ldf, msr_attribute, exclude_nan)
+    dimension_lst = vis.get_attr_by_data_model("dimension")
+    if len(uv) != len(vdata) and len(dimension_lst) == 1:
+        # filtered bars are not zero-filled when only the most frequent values of the dimension are stored
+        groupby_attr = dimension_lst[0].attribute
+        vdata = uv[[groupby_attr]].merge(vdata, on=groupby_attr, how="left").fillna(0)
+        v_size = len(vdata)
+        v_filter = vdata[msr_attribute] / total
     assert len(v) == len(v_filter), "Data for filtered and unfiltered vis have unequal length."
     sig = v_filter_size / v_size  # significance factor
     # Euclidean distance as L2 function
@@ -259,13 +272,12 @@ def deviation_from_overall(
         dimList = vis.get_attr_by_data_model("dimension")
 
         # use Pandas rank function to calculate rank positions for each category
-        v_rank = uv.rank()
-        v_filter_rank = vdata.rank()
-        # go through and count the number of ranking changes between the filtered and unfiltered data
+        v_filter_rank = vdata[msr_attribute].rank()
+        # count the number of ranking changes between the filtered and unfiltered data
         numCategories = ldf.cardinality[dimList[0].attribute]
-        for r in range(0, numCategories - 1):
-            if v_rank[msr_attribute][r] != v_filter_rank[msr_attribute][r]:
-                rankSig += 1
+        categories = list(range(0, numCategories - 1))
+        rank_changes = v_rank.loc[categories].to_numpy() != v_filter_rank.loc[categories].to_numpy()
+        rankSig += int(rank_changes.sum())
         # normalize ranking significance factor
         rankSig = rankSig / numCategories
 
@@ -274,6 +286,49 @@ def deviation_from_overall(
     return sig * rankSig * euclidean(v, v_filter)
 
 
+def get_overall_baseline(vis: Vis, ldf: LuxDataFrame, msr_attribute: str, exclude_nan: bool = True):
+    """
+    Data of the "Overall" vis, which has the attributes of the vis without its filters, along with its
+    normalized measure values and their ranks. The baseline is saved with the results of the overall vis,
+    so that it is computed once for all the filtered vis with the same attributes, aggregation and bins.
+
+    Parameters
+    ----------
+    vis : Vis
+    ldf : LuxDataFrame
+    msr_attribute : str
+            The attribute name of the measure value of the chart
+    exclude_nan: bool
+            Whether to include/exclude NaN values as part of the deviation calculation
+
+    Returns
+    -------
+    tuple
+            Data of the overall vis, its measure values normalized by their total, and their ranks
+    """
+    import copy
+
+    unfiltered_vis = copy.copy(vis)
+    # Remove filters, keep only attribute intent
+    unfiltered_vis._inferred_intent = utils.get_attrs_specs(vis._inferred_intent)
+    result = ldf._get_vis_result(unfiltered_vis)
+    if result is not None and (msr_attribute, exclude_nan) in result.get("baselines", {}):
+        return result["baselines"][(msr_attribute, exclude_nan)]
+    lux.config.executor.execute([unfiltered_vis], ldf)
+    if exclude_nan:
+        uv = unfiltered_vis.data.dropna()
+    else:
+        uv = unfiltered_vis.data
+    v = uv[msr_attribute]
+    v = v / v.sum()
+    baseline = (uv, v, uv[msr_attribute].rank())
+    result = ldf._get_vis_result(unfiltered_vis)
+    baselines = dict(result.get("baselines", {})) if result is not None else {}
+    baselines[(msr_attribute, exclude_nan)] = baseline
+    ldf._save_vis_result(unfiltered_vis, baselines=baselines)
+    return baseline
+
+
 def unevenness(vis: Vis, ldf: LuxDataFrame, measure_lst: list, dimension_lst: list) -> int:
     """
     Measure the unevenness of a bar chart vis.
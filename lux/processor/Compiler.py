@@ -159,7 +159,12 @@ class Compiler:
         # TODO: copy might not be neccesary
         from lux.utils.date_utils import is_datetime_string
 
-        data_model_lookup = lux.config.executor.compute_data_model_lookup(ldf.data_type)
+        # only the metadata of the columns used by the visualizations is needed
+        attributes = set()
+        for vis in vlist:
+            attributes.update(utils.get_vis_attributes(vis))
+        ldf.maintain_metadata(columns=attributes)
+        data_model_lookup = lux.config.executor.compute_data_model_lookup(ldf._data_type)
 
         for vis in vlist:
             for clause in vis._inferred_intent:
@@ -169,7 +174,7 @@ class Compiler:
                 # and not is_datetime_string(clause.attribute):
                 if clause.attribute != "" and clause.attribute != "Record":
                     if clause.data_type == "":
-                        clause.data_type = ldf.data_type[clause.attribute]
+                        clause.data_type = ldf._data_type[clause.attribute]
                     if clause.data_type == "id":
                         clause.data_type = "nominal"
                     if clause.data_model == "":
@@ -439,10 +444,12 @@ class Compiler:
                 a dictionary that holds the attributes and filters generated from wildcards and constraints.
         """
         import copy
-        from lux.utils.utils import convert_to_list
+        from lux.utils.utils import convert_to_list, get_intent_attributes
 
-        inverted_data_type = lux.config.executor.invert_data_type(ldf.data_type)
-        data_model = lux.config.executor.compute_data_model(ldf.data_type)
+        # the metadata of every column is only needed to expand wildcard attributes
+        ldf.maintain_metadata(columns=get_intent_attributes(_inferred_intent))
+        inverted_data_type = lux.config.executor.invert_data_type(ldf._data_type)
+        data_model = lux.config.executor.compute_data_model(ldf._data_type)
 
         intent = {"attributes": [], "filters": []}
         for clause in _inferred_intent:
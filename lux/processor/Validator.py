@@ -55,6 +55,9 @@ class Validator:
 
         """
 
+        # only the metadata of the columns referenced by the intent is needed
+        ldf.maintain_metadata(columns=lux.utils.utils.get_intent_attributes(intent))
+
         def validate_clause(clause):
             warn_msg = ""
             if not (clause.attribute == "?" or clause.value == "?" or clause.attribute == ""):
@@ -73,9 +76,15 @@ class Validator:
                             if not clause.attribute in list(ldf.columns):
                                 search_val = clause.attribute
                                 match_attr = False
+                                # the input may be a value of any column
+                                ldf.maintain_metadata()
                                 for attr, val_list in ldf.unique_values.items():
                                     if search_val in val_list:
                                         match_attr = attr
+                                    elif lux.utils.utils.unique_values_truncated(ldf, attr):
+                                        # only the most frequent values are kept, so check the column itself
+                                        if (ldf[attr] == search_val).any():
+                                            match_attr = attr
                                 if match_attr:
                                     warn_msg = f"\n- The input '{search_val}' looks like a value that belongs to the '{match_attr}' attribute. \n  Please specify the value fully, as something like {match_attr}={search_val}."
                                 else:
@@ -89,8 +98,15 @@ class Validator:
                                         vals = clause.value
                                     else:
                                         vals = [clause.value]
+                                    # the stored unique values are much smaller than the column itself
+                                    if clause.attribute in ldf.unique_values and not (
+                                        lux.utils.utils.unique_values_truncated(ldf, clause.attribute)
+                                    ):
+                                        col_vals = ldf.unique_values[clause.attribute]
+                                    else:
+                                        col_vals = series.values
                                     for val in vals:
-                                        if val not in series.values:
+                                        if val not in col_vals:
                                             warn_msg = f"\n- The input value '{val}' does not exist for the attribute '{clause.attribute}' for the DataFrame."
             return warn_msg
 
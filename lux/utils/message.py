@@ -25,6 +25,9 @@ class Message:
     def add(self, item, priority=-1):
         self.messages.append({"text": item, "priority": priority})
 
+    def remove(self, priority):
+        self.messages = [msg for msg in self.messages if msg["priority"] != priority]
+
     def to_html(self):
         if len(self.messages) == 0:
             return ""
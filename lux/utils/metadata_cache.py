@@ -0,0 +1,128 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""
+On-disk cache of the metadata computed for each column, enabled by setting lux.config.metadata_cache_dir.
+Each entry is stored in its own file, named after the fingerprint of the column it describes.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+import lux
+
+# changing how the metadata of a column is computed must bump the version, so that older entries are ignored
+CACHE_VERSION = 1
+BLOCK_SIZE = 1024
+NUM_BLOCKS = 32
+CACHE_SUFFIX = ".pkl"
+
+
+def column_fingerprint(series):
+    """
+    Computes a cheap fingerprint of the content of a column, from its name, dtype and length
+    and a hash of blocks of values sampled evenly over the column.
+
+    Since only the sampled blocks are hashed, a change to values outside of these blocks
+    that preserves the dtype and length of the column does not change its fingerprint.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Column to fingerprint
+
+    Returns
+    -------
+    fingerprint: Optional[str]
+        Hexadecimal digest of the column, or None if its values cannot be hashed
+    """
+    length = len(series)
+    if length > BLOCK_SIZE * NUM_BLOCKS:
+        starts = np.linspace(0, length - BLOCK_SIZE, NUM_BLOCKS).astype(np.int64)
+        series = series.iloc[(starts[:, None] + np.arange(BLOCK_SIZE)).ravel()]
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(
+        repr(
+            (CACHE_VERSION, repr(series.name), repr(series.dtype), length, lux.config.unique_values_cap)
+        ).encode()
+    )
+    try:
+        digest.update(pd.util.hash_pandas_object(series, index=False).values.tobytes())
+    except TypeError:
+        return None
+    return digest.hexdigest()
+
+
+def load(directory, fingerprint):
+    """
+    Returns the metadata stored for the column with the given fingerprint, or None if there is none.
+    """
+    path = os.path.join(directory, fingerprint + CACHE_SUFFIX)
+    try:
+        with open(path, "rb") as f:
+            entry = pickle.load(f)
+        # the modification time records when the entry was last used, for eviction
+        os.utime(path)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+    return entry
+
+
+def store(directory, entries, size_limit):
+    """
+    Writes the metadata of each fingerprint in entries, then evicts the least recently used entries
+    until the cache fits in size_limit bytes.
+    """
+    if not entries:
+        return
+    try:
+        os.makedirs(directory, exist_ok=True)
+        for fingerprint, entry in entries.items():
+            try:
+                data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                continue
+            # write to a temporary file first so that concurrent readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(directory, fingerprint + CACHE_SUFFIX))
+        evict(directory, size_limit)
+    except OSError:
+        pass
+
+
+def evict(directory, size_limit):
+    """
+    Removes the least recently used entries of the cache until its total size is at most size_limit bytes.
+    """
+    files = []
+    total_size = 0
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith(CACHE_SUFFIX) and entry.is_file():
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+    files.sort()
+    for _, size, path in files:
+        if total_size <= size_limit:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total_size -= size
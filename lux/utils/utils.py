@@ -11,6 +11,7 @@
 #  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -48,6 +49,57 @@ def get_filter_specs(intent):
     return spec_obj
 
 
+def get_vis_key(vis):
+    """
+    Canonical representation of the compiled intent of a vis, which does not depend on the order of its clauses.
+    Two vis with the same key fetch the same data from the same dataframe.
+    """
+    clauses = frozenset(
+        (
+            repr(clause.attribute),
+            repr(clause.value),
+            clause.filter_op,
+            clause.channel,
+            clause.data_type,
+            clause.aggregation,
+            clause.bin_size,
+            clause.sort,
+        )
+        for clause in vis._inferred_intent
+    )
+    return (vis.mark, clauses)
+
+
+def get_vis_attributes(vis):
+    """
+    Set of columns that the data of a vis depends on, including the attributes of its filters.
+    """
+    attributes = set()
+    for clause in vis._inferred_intent:
+        for attr in convert_to_list(clause.attribute):
+            if attr != "" and attr != "Record":
+                attributes.add(attr)
+    return attributes
+
+
+def get_intent_attributes(intent):
+    """
+    List of columns referenced by the clauses of a parsed intent, whose metadata is needed to process it.
+    Returns None if the intent contains a wildcard attribute, which may refer to any column.
+    """
+    attributes = []
+    clauses = []
+    for clause in intent:
+        clauses.extend(convert_to_list(clause))
+    for clause in clauses:
+        for attr in convert_to_list(clause.attribute):
+            if attr == "?":
+                return None
+            if attr != "" and attr != "Record":
+                attributes.append(attr)
+    return attributes
+
+
 def check_import_lux_widget():
     import pkgutil
 
@@ -76,32 +128,60 @@ def check_if_id_like(df, attribute):
 
     # Strong signals
     # so that aggregated reset_index fields don't get misclassified
-    high_cardinality = df.cardinality[attribute] > 500
+    # the cheap checks on the cardinality come first, so that most columns never need to be scanned
+    cardinality = df.cardinality[attribute]
+    high_cardinality = cardinality > 500
+    if not high_cardinality:
+        return False
     attribute_contain_id = re.search(r"id|ID|iD|Id", str(attribute)) is not None
-    almost_all_vals_unique = df.cardinality[attribute] >= 0.98 * len(df)
-    is_string = pd.api.types.is_string_dtype(df[attribute])
-    if is_string:
+    series = df[attribute]
+    if pd.api.types.is_string_dtype(series):
+        almost_all_vals_unique = cardinality >= 0.98 * len(df)
+        if not (attribute_contain_id or almost_all_vals_unique):
+            return False
         # For string IDs, usually serial numbers or codes with alphanumerics have a consistent length (eg., CG-39405) with little deviation. For a high cardinality string field but not ID field (like Name or Brand), there is less uniformity across the string lengths.
         if len(df) > 50:
-            sampled = df[attribute].sample(50, random_state=99)
+            sampled = series.values[np.random.RandomState(99).choice(len(df), size=50, replace=False)]
         else:
-            sampled = df[attribute]
-        str_length_uniformity = sampled.apply(lambda x: type(x) == str and len(x)).std() < 3
-        return (
-            high_cardinality
-            and (attribute_contain_id or almost_all_vals_unique)
-            and str_length_uniformity
-        )
+            sampled = series.values
+        str_lengths = np.array([len(x) if type(x) == str else 0 for x in sampled])
+        return len(str_lengths) > 1 and str_lengths.std(ddof=1) < 3
     else:
-        if len(df) >= 2:
-            series = df[attribute]
-            diff = series.diff()
-            evenly_spaced = all(diff.iloc[1:] == diff.iloc[1])
-        else:
-            evenly_spaced = True
         if attribute_contain_id:
-            almost_all_vals_unique = df.cardinality[attribute] >= 0.75 * len(df)
-        return high_cardinality and (almost_all_vals_unique or evenly_spaced)
+            almost_all_vals_unique = cardinality >= 0.75 * len(df)
+        else:
+            almost_all_vals_unique = cardinality >= 0.98 * len(df)
+        return almost_all_vals_unique or is_evenly_spaced(series)
+
+
+def is_evenly_spaced(series, sample_size=1000):
+    """
+    Check whether the difference between consecutive values of the series is constant.
+    The first values of the series are checked first, so that the whole series is only scanned
+    when they are evenly spaced.
+    """
+    if len(series) < 3:
+        return True
+    values = series.values
+    if not isinstance(values, np.ndarray) or values.dtype == object:
+        diff = series.diff()
+        return bool((diff.iloc[1:] == diff.iloc[1]).all())
+    head_diff = np.diff(values[: sample_size + 1])
+    if not (head_diff == head_diff[0]).all():
+        return False
+    diff = np.diff(values)
+    return bool((diff == diff[0]).all())
+
+
+def unique_values_truncated(df, attribute):
+    """
+    Check whether df.unique_values only holds the most frequent values of the attribute,
+    which is the case when its cardinality exceeds lux.config.unique_values_cap.
+    """
+    profile = getattr(df, "_column_profile", None)
+    if not profile or attribute not in profile:
+        return False
+    return profile[attribute].get("truncated", False)
 
 
 def like_nan(val):
@@ -347,7 +347,7 @@ class Vis:
 
             self.check_not_vislist_intent()
 
-            ldf.maintain_metadata()
+            # the validator and compiler compute the metadata of the columns used by the vis
             self._source = ldf
             self._inferred_intent = Parser.parse(self._intent)
             Validator.validate_intent(self._inferred_intent, ldf)
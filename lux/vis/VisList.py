@@ -300,8 +300,8 @@ class VisList:
             from lux.processor.Validator import Validator
             from lux.processor.Compiler import Compiler
 
+            # the validator and compiler compute the metadata of the columns used by the visualizations
             self._source = ldf
-            self._source.maintain_metadata()
             if len(self._input_lst) > 0:
                 if self._is_vis_input():
                     compiled_collection = []
@@ -1,5 +1,6 @@
 import pytest
 import pandas as pd
+from .context import lux
 
 
 @pytest.fixture(scope="session")
@@ -8,3 +9,23 @@ def global_var():
     pytest.olympic = pd.read_csv(url)
     pytest.car_df = pd.read_csv("lux/data/car.csv")
     pytest.college_df = pd.read_csv("lux/data/college.csv")
+
+
+@pytest.fixture
+def restore_config():
+    """
+    Restores the lux.config options changed by a test once it has run, also when one of its assertions fails.
+    """
+    options = [
+        "unique_values_cap",
+        "metadata_cache_dir",
+        "metadata_cache_size",
+        "num_workers",
+        "vis_cache_size",
+        "progressive_sampling",
+        "stratified_sampling",
+    ]
+    saved = {option: getattr(lux.config, option) for option in options}
+    yield
+    for option, value in saved.items():
+        setattr(lux.config, option, value)
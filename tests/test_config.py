@@ -243,6 +243,62 @@ def test_sampling_parameters_config():
     lux.config.sampling_start = 10000
 
 
+def test_unique_values_cap_config(restore_config):
+    lux.config.unique_values_cap = 50
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    assert df.cardinality["Name"] == len(df["Name"].unique())
+    assert len(df.unique_values["Name"]) == 50
+    top_names = df["Name"].value_counts()
+    assert top_names[df.unique_values["Name"][0]] == top_names.max()
+    assert set(df.unique_values["Name"]).issubset(set(top_names.index))
+    assert df.unique_values["Origin"] == list(df["Origin"].unique())
+
+    df.intent = ["Name", "Origin=USA"]
+    df._repr_html_()
+
+
+def test_metadata_cache_config(tmp_path, restore_config):
+    lux.config.metadata_cache_dir = str(tmp_path)
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    assert len(list(tmp_path.iterdir())) == len(df.columns)
+
+    cached_df = pd.read_csv("lux/data/car.csv")
+    cached_df.maintain_metadata()
+    assert cached_df.unique_values == df.unique_values
+    assert cached_df.cardinality == df.cardinality
+    assert cached_df._min_max == df._min_max
+    assert cached_df.data_type == df.data_type
+
+    # a modified column gets a new fingerprint, so its metadata is recomputed
+    changed_df = pd.read_csv("lux/data/car.csv")
+    changed_df["Horsepower"] = changed_df["Horsepower"] * 2
+    changed_df.maintain_metadata()
+    assert changed_df._min_max["Horsepower"] == (
+        df._min_max["Horsepower"][0] * 2,
+        df._min_max["Horsepower"][1] * 2,
+    )
+
+    lux.config.metadata_cache_size = 1
+    df = pd.read_csv("lux/data/car.csv")
+    df["Weight"] = df["Weight"] + 1
+    df.maintain_metadata()
+    assert len(list(tmp_path.iterdir())) <= 1
+
+
+def test_num_workers_config(restore_config):
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    lux.config.num_workers = 4
+    parallel_df = pd.read_csv("lux/data/car.csv")
+    parallel_df.maintain_metadata()
+    assert parallel_df.unique_values == df.unique_values
+    assert parallel_df.cardinality == df.cardinality
+    assert parallel_df._min_max == df._min_max
+    assert list(parallel_df.data_type.items()) == list(df.data_type.items())
+
+
 def test_heatmap_flag_config():
     df = pd.read_csv("https://raw.githubusercontent.com/lux-org/lux-datasets/master/data/airbnb_nyc.csv")
     df._repr_html_()
@@ -305,3 +361,25 @@ def test_sort(global_var):
 # 	vis_code = df.recommendation["Correlation"][0].to_Altair()
 # 	print (vis_code)
 # 	assert 'chart = chart.configure_mark(color="green")' in vis_code, "Exported chart does not have additional plot style setting."
+
+
+def test_vis_cache_size_config(restore_config):
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    assert len(df._vis_results) > 1
+    lux.config.vis_cache_size = 1
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    assert len([result for result in df._vis_results.values() if "data" in result]) <= 1
+
+
+def test_progressive_sampling_config(restore_config):
+    df = pd.concat([pd.read_csv("lux/data/car.csv")] * 5, ignore_index=True)
+    lux.config.progressive_sampling = True
+    df._repr_html_()
+    assert df._refine_thread is not None
+    df._refine_thread.join()
+    assert len(df._rec_info) > 0
+    for rec in df._rec_info:
+        assert rec["sample_size"] == len(df)
+    assert len(df._sampled) == len(df)
@@ -196,3 +196,154 @@ def test_exclude_attribute(global_var):
         assert vis.get_attr_by_channel("x")[0].attribute != "Name"
         assert vis.get_attr_by_channel("y")[0].attribute != "Year"
         assert vis.get_attr_by_channel("y")[0].attribute != "Year"
+
+
+def test_column_profile():
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+    for attr in df.columns:
+        assert df.unique_values[attr] == list(df[attr].unique())
+        assert df.cardinality[attr] == len(df[attr].unique())
+        assert sum(df._column_profile[attr]["value_counts"]) == len(df)
+    assert df._min_max["Horsepower"] == (df["Horsepower"].min(), df["Horsepower"].max())
+
+    # None and NaN are reported as separate unique values, just like Series.unique
+    series = pd.Series(["a", None, "b", "a", float("nan"), None])
+    profile = PandasExecutor.compute_column_profile(series)
+    assert len(profile["unique_values"]) == 4
+    assert profile["unique_values"][:3] == ["a", None, "b"]
+    assert profile["value_counts"] == [2, 2, 1, 1]
+    assert profile["null_count"] == 3
+
+
+def test_shared_aggregation():
+    df = pd.read_csv("lux/data/car.csv")
+    intent = [lux.Clause("Origin"), lux.Clause("?", data_type="quantitative"), lux.Clause("Cylinders=4")]
+    vislist = VisList(intent, df)
+    assert len(vislist) > 1
+    for vis in vislist:
+        single = Vis(vis._inferred_intent, pd.read_csv("lux/data/car.csv"))
+        assert vis.data.to_dict() == single.data.to_dict()
+
+
+def test_shared_binning():
+    df = pd.read_csv("lux/data/car.csv")
+    vislist = VisList([lux.Clause("?", data_type="quantitative")], df)
+    assert len(vislist) > 1
+    for vis in vislist:
+        assert vis.mark == "histogram"
+        single = Vis(vis._inferred_intent, pd.read_csv("lux/data/car.csv"))
+        assert vis.data.to_dict() == single.data.to_dict()
+
+
+def test_block_binning():
+    import numpy as np
+
+    columns = [
+        np.array([0.1, 0.2, 0.3, 0.7, 1.0, np.nan]),
+        np.array([5.0, 5.0, 5.0, 5.0, 5.0, 5.0]),
+        np.array([-3.0, 1e-9, 2.5, 2.5, 7.0, 10.0]),
+    ]
+    first_edges = np.array([np.nanmin(column) for column in columns])
+    last_edges = np.array([np.nanmax(column) for column in columns])
+    counts, bin_edges = PandasExecutor.execute_block_binning(columns, first_edges, last_edges, 10)
+    for column, column_counts, column_edges in zip(columns, counts, bin_edges):
+        expected_counts, expected_edges = np.histogram(column[~np.isnan(column)], bins=10)
+        assert list(column_counts) == list(expected_counts)
+        assert np.allclose(column_edges, expected_edges)
+
+
+def test_partitioned_filter():
+    df = pd.read_csv("lux/data/car.csv")
+    intent = [lux.Clause("Horsepower"), lux.Clause("Origin")]
+    values = [3, 4, 6, 8, 7]
+    vislist = VisList(
+        [Vis(intent + [lux.Clause(attribute="Cylinders", value=val)]) for val in values], df
+    )
+    for vis in vislist:
+        single = Vis(vis._inferred_intent, pd.read_csv("lux/data/car.csv"))
+        assert vis.data.to_dict() == single.data.to_dict()
+
+    df = pd.read_csv("lux/data/car.csv")
+    PandasExecutor.execute_sampling(df)
+    partitions = PandasExecutor.execute_partitioned_filter(vislist, df)
+    assert len(partitions) == len(values)
+    for vis, val in zip(vislist, values):
+        assert len(partitions[id(vis)]) == len(df[df["Cylinders"] == val])
+
+
+def test_filter_bitmap_cache():
+    df = pd.read_csv("lux/data/car.csv")
+    filters = [
+        lux.Clause(attribute="Origin", value="USA"),
+        lux.Clause(attribute="Cylinders", filter_op=">", value=4),
+    ]
+    result = PandasExecutor.apply_filters(df, filters)
+    expected = df[(df["Origin"] == "USA") & (df["Cylinders"] > 4)]
+    assert list(result.index) == list(expected.index)
+    bitmap = PandasExecutor.get_filter_bitmap(df, "Origin", "=", "USA")
+    assert PandasExecutor.get_filter_bitmap(df, "Origin", "=", "USA") is bitmap
+
+    # modifying the data expires the cached bitmaps
+    df["Origin"] = "USA"
+    assert len(PandasExecutor.apply_filter(df, "Origin", "=", "USA")) == len(df)
+
+
+def test_stratified_sampling(restore_config):
+    import numpy as np
+
+    lux.config.stratified_sampling = True
+    groups = np.array(["a", "b"] * 19990 + ["rare"] * 20)
+    df = pd.DataFrame({"Group": groups, "Value": np.arange(len(groups)) % 7})
+    vis = Vis(["Group"], df)
+    assert (df._sampled["Group"] == "rare").sum() == 20
+    counts = dict(zip(vis.data["Group"], vis.data["Record"]))
+    assert counts["rare"] == 20
+    assert abs(counts["a"] - 19990) < 0.05 * 19990
+
+
+def test_streaming_executor(tmp_path):
+    from lux.executor.StreamingExecutor import read_stream
+
+    path = str(tmp_path / "car.csv")
+    car_df = pd.read_csv("lux/data/car.csv")
+    car_df.to_csv(path, index=False)
+    sampling_start, sampling_cap = lux.config.sampling_start, lux.config.sampling_cap
+    try:
+        # the cap may not be lower than the number of rows from which sampling starts
+        lux.config.sampling_start = 50
+        lux.config.sampling_cap = 100
+        df = read_stream(path, chunksize=50)
+        assert len(df) == 100
+        # the charts of the file are compared with those of the whole dataframe, which is then not sampled
+        lux.config.sampling_cap = sampling_cap
+        lux.config.sampling_start = sampling_start
+        df.maintain_metadata()
+        car_df.maintain_metadata()
+        assert df.cardinality["Origin"] == car_df.cardinality["Origin"]
+        assert df._min_max["Horsepower"] == car_df._min_max["Horsepower"]
+
+        # bar charts and histograms are computed over the whole file instead of the sample
+        intents = [
+            ["Origin", "Horsepower"],
+            ["Cylinders"],
+            ["Horsepower"],
+            [
+                lux.Clause("Horsepower"),
+                lux.Clause("Cylinders"),
+                lux.Clause(attribute="Origin", value="USA"),
+            ],
+        ]
+        for intent in intents:
+            vis = Vis(intent, df)
+            expected = Vis(intent, car_df)
+            assert list(vis.data.columns) == list(expected.data.columns)
+            for column in vis.data.columns:
+                if vis.data[column].dtype == object:
+                    assert list(vis.data[column]) == list(expected.data[column])
+                else:
+                    assert list(vis.data[column]) == pytest.approx(list(expected.data[column]))
+    finally:
+        lux.config.sampling_cap = sampling_cap
+        lux.config.sampling_start = sampling_start
+        lux.config.set_executor_type("Pandas")
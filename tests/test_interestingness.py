@@ -293,3 +293,21 @@ def test_interestingness_deviation_nan():
     assert np.isclose(smaller_diff_score, 0.29, rtol=0.1)
     assert np.isclose(bigger_diff_score, 0.94, rtol=0.1)
     assert smaller_diff_score < bigger_diff_score
+
+
+def test_interestingness_deviation_baseline():
+    from lux.vis.Vis import Vis
+    from lux.interestingness.interestingness import deviation_from_overall
+
+    df = pd.read_csv("lux/data/car.csv")
+    vis = Vis(["Origin", "Horsepower", lux.Clause(attribute="Cylinders", value=4)], df)
+    vis2 = Vis(["Origin", "Horsepower", lux.Clause(attribute="Cylinders", value=8)], df)
+    filter_specs = lux.utils.utils.get_filter_specs(vis2._inferred_intent)
+    score = deviation_from_overall(vis2, df, filter_specs, "Horsepower")
+    assert score > 0
+    assert interestingness(vis, df) > 0
+    overall = Vis(["Origin", "Horsepower"], df)
+    assert ("Horsepower", True) in df._get_vis_result(overall)["baselines"]
+
+    # the score computed from the saved baseline is the same as from a newly computed one
+    assert deviation_from_overall(vis2, df, filter_specs, "Horsepower") == score
@@ -81,3 +81,146 @@ def test_recs_inplace_operation(global_var):
     df._repr_html_()
     assert len(df.recommendation["Occurrence"]) == 3
     assert df._recs_fresh == True, "Failed to maintain recommendation after display df"
+
+
+def test_metadata_column_update():
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    assert df._metadata_fresh == True, "Failed to maintain metadata after display df"
+    weight_vis = [key for key, result in df._vis_results.items() if "Weight" in result["attributes"]]
+    assert len(weight_vis) > 0
+
+    df["Weight"] = df["Weight"] > 3000
+    df["Weight2"] = df["Cylinders"] * 2
+    assert df._metadata_fresh == True, "Metadata of unmodified columns should be kept"
+    assert df._dirty_columns == {"Weight", "Weight2"}
+    assert df._recs_fresh == False, "Failed to expire recommendation after column assignment"
+    for key in weight_vis:
+        assert key not in df._vis_results, "Failed to expire vis that depend on the modified column"
+
+    df._repr_html_()
+    expected = pd.read_csv("lux/data/car.csv")
+    expected["Weight"] = expected["Weight"] > 3000
+    expected["Weight2"] = expected["Cylinders"] * 2
+    expected.maintain_metadata()
+    assert df.data_type == expected.data_type
+    assert df.cardinality == expected.cardinality
+    assert df.unique_values == expected.unique_values
+    assert df._min_max == expected._min_max
+    assert df.data_type["Weight"] == "nominal"
+
+    df.columns = ["Weight3" if col == "Weight2" else col for col in df.columns]
+    assert df._dirty_columns == {"Weight2", "Weight3"}
+    df.maintain_metadata()
+    assert "Weight2" not in df.data_type and "Weight2" not in df.cardinality
+    assert df.cardinality["Weight3"] == expected.cardinality["Weight2"]
+
+
+def test_vis_results_kept_across_intents():
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    keys = set(df._vis_results)
+    assert len(keys) > 0
+    df.intent = ["Horsepower"]
+    assert keys.issubset(df._vis_results), "Changing the intent should not expire the data of the vis"
+    df._repr_html_()
+    df.clear_intent()
+    df._repr_html_()
+    assert keys.issubset(df._vis_results)
+
+    df.set_data_type({"Cylinders": "quantitative"})
+    assert len(df._vis_results) == 0, "Failed to expire vis after overriding a data type"
+
+
+def test_metadata_data_version():
+    df = pd.read_csv("lux/data/car.csv")
+    df._repr_html_()
+    version = df._data_version
+    df.Horsepower
+    df["Horsepower"].max()
+    assert df._data_version == version, "Read-only access should not modify the data version"
+    assert df._metadata_fresh == True and df._recs_fresh == True
+
+    df.loc[0, "Horsepower"] = 1000
+    assert df._data_version > version
+    assert df._recs_fresh == False, "Failed to expire recommendation after setting values"
+    df._repr_html_()
+    assert df._min_max["Horsepower"][1] == 1000
+    assert df._metadata_version == df._data_version and df._recs_version == df._data_version
+
+    del df["Weight"]
+    df.maintain_metadata()
+    assert "Weight" not in df.data_type and "Weight" not in df.cardinality
+
+
+def test_metadata_derived_from_parent():
+    df = pd.read_csv("lux/data/car.csv")
+    df.maintain_metadata()
+
+    projected = df[["Horsepower", "Origin"]]
+    filtered = df[df["Year"] > 1975]
+    for child in [projected, filtered]:
+        assert child._metadata_source is not None
+        child.maintain_metadata()
+        assert child._metadata_fresh == True
+        expected = pd.DataFrame(child.copy())
+        expected.maintain_metadata()
+        assert child.unique_values == expected.unique_values
+        assert child.cardinality == expected.cardinality
+        assert child._min_max == expected._min_max
+    assert projected.data_type == {"Horsepower": "quantitative", "Origin": "nominal"}
+    assert filtered.data_type == df.data_type
+    assert filtered.cardinality["Year"] < df.cardinality["Year"]
+
+    # a dataframe modified since the selection can not be used to derive the metadata of a view
+    sliced = df.iloc[:, 1:4]
+    assert sliced._derived_metadata_axis() == 1
+    df.loc[0, "MilesPerGal"] = 100
+    assert sliced._derived_metadata_axis() is None
+    sliced.maintain_metadata()
+    assert sliced._min_max["MilesPerGal"][1] == sliced["MilesPerGal"].max()
+
+
+def test_metadata_computed_on_request():
+    df = pd.read_csv("lux/data/car.csv")
+    vis = Vis(["Horsepower", "Origin=USA"], df)
+    assert set(df.cardinality) == {"Horsepower", "Origin"}
+    assert "Weight" in df._metadata_pending
+
+    df.intent = ["Weight", "Origin"]
+    assert set(df.cardinality) == {"Horsepower", "Origin", "Weight"}
+
+    expected = pd.read_csv("lux/data/car.csv")
+    expected.maintain_metadata()
+    df._repr_html_()
+    assert not df._metadata_pending
+    assert list(df.data_type.items()) == list(expected.data_type.items())
+    assert df.cardinality == expected.cardinality
+    assert df.unique_values == expected.unique_values
+    assert df._min_max == expected._min_max
+
+
+def test_metadata_computed_on_request_executor_subclass():
+    from lux.executor.PandasExecutor import PandasExecutor
+
+    class CustomExecutor(PandasExecutor):
+        def __init__(self):
+            super().__init__()
+            self.name = "CustomExecutor"
+
+    lux.config.executor = CustomExecutor()
+    try:
+        df = pd.read_csv("lux/data/car.csv")
+        Vis(["Horsepower", "Origin=USA"], df)
+        assert set(df.cardinality) == {"Horsepower", "Origin"}
+        assert "Weight" in df._metadata_pending
+    finally:
+        lux.config.set_executor_type("Pandas")
+
+
+def test_metadata_requested_after_sampling():
+    df = pd.concat([pd.read_csv("lux/data/car.csv")] * 30, ignore_index=True)
+    Vis(["Weight", "Horsepower"], df)
+    assert df._sampled is not df
+    vis = Vis(["Horsepower", "Origin", "Cylinders"], df)
+    assert len(vis.data) == len(df.unique_values["Origin"]) * len(df.unique_values["Cylinders"])
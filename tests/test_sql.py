@@ -0,0 +1,195 @@
+#  Copyright 2019-2020 The Lux Authors.
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+from .context import lux
+import pytest
+import sqlite3
+import pandas as pd
+from lux.vis.Vis import Vis
+from lux.vis.VisList import VisList
+
+
+@pytest.fixture
+def sql_df():
+    car_df = pd.read_csv("lux/data/car.csv")
+    connection = sqlite3.connect(":memory:")
+    car_df.to_sql("car", connection, index=False)
+    lux.config.set_SQL_connection(connection)
+    lux.config.set_executor_type("SQL")
+    sql_df = pd.DataFrame()
+    sql_df.set_SQL_table("car")
+    yield sql_df
+    lux.config.sql_batch_size = 50
+    lux.config.set_SQL_connection("")
+    lux.config.set_executor_type("Pandas")
+    connection.close()
+
+
+def test_sql_metadata(sql_df):
+    car_df = pd.read_csv("lux/data/car.csv")
+    assert list(sql_df.columns) == list(car_df.columns)
+    assert sql_df.data_type["Origin"] == "nominal"
+    assert sql_df.data_type["Cylinders"] == "nominal"
+    assert sql_df.data_type["Horsepower"] == "quantitative"
+    assert sql_df.data_type["Year"] == "temporal"
+    assert sql_df.cardinality["Origin"] == 3
+    assert set(sql_df.unique_values["Origin"]) == {"USA", "Europe", "Japan"}
+    assert sql_df._min_max["Horsepower"] == (car_df["Horsepower"].min(), car_df["Horsepower"].max())
+
+    # the distinct counts and min/max of all the columns are computed with a single query
+    statements = []
+    lux.config.SQLconnection.set_trace_callback(statements.append)
+    sql_df.set_SQL_table("car")
+    lux.config.SQLconnection.set_trace_callback(None)
+    assert len([statement for statement in statements if "COUNT(DISTINCT" in statement]) == 1
+    assert len([statement for statement in statements if "PRAGMA" in statement]) == 1
+
+
+def test_sql_aggregate(sql_df):
+    car_df = pd.read_csv("lux/data/car.csv")
+    vis = Vis(["Origin", "Horsepower"], sql_df)
+    result = dict(zip(vis.data["Origin"], vis.data["Horsepower"]))
+    expected = car_df.groupby("Origin")["Horsepower"].mean()
+    assert result == pytest.approx(expected.to_dict())
+
+    vis = Vis([lux.Clause("Cylinders"), lux.Clause(attribute="Origin", value="Europe")], sql_df)
+    result = dict(zip(vis.data["Cylinders"], vis.data["Record"]))
+    expected = car_df[car_df["Origin"] == "Europe"]["Cylinders"].value_counts()
+    for cylinders in car_df["Cylinders"].unique():
+        assert result[cylinders] == expected.get(cylinders, 0)
+
+
+def test_sql_binning(sql_df):
+    car_df = pd.read_csv("lux/data/car.csv")
+    vis = Vis(["Horsepower"], sql_df)
+    assert list(vis.data.columns) == ["Horsepower", "Number of Records"]
+    assert len(vis.data) == vis._inferred_intent[0].bin_size
+    assert vis.data["Number of Records"].sum() == car_df["Horsepower"].notna().sum()
+
+
+def test_sql_batch(sql_df):
+    intents = [
+        ["Origin", "Horsepower"],
+        ["Cylinders"],
+        ["Horsepower"],
+        [lux.Clause("Weight"), lux.Clause(attribute="Origin", value="USA")],
+        ["Horsepower", "Weight"],
+    ]
+    vislist = VisList([Vis(intent) for intent in intents], sql_df)
+    lux.config.sql_batch_size = 1
+    for vis, intent in zip(vislist, intents):
+        single = Vis(intent, sql_df)
+        assert vis.data.to_dict() == single.data.to_dict()
+    assert len(vislist[4].data) == len(pd.read_csv("lux/data/car.csv"))
+
+
+def test_sql_connection_factory(tmp_path):
+    path = str(tmp_path / "car.db")
+    connection = sqlite3.connect(path)
+    pd.read_csv("lux/data/car.csv").to_sql("car", connection, index=False)
+    connection.close()
+    intents = [["Origin", "Horsepower"], ["Cylinders"], ["Horsepower"], ["Horsepower", "Weight"]]
+
+    try:
+        lux.config.set_SQL_connection(sqlite3.connect(path))
+        lux.config.set_executor_type("SQL")
+        serial_df = pd.DataFrame()
+        serial_df.set_SQL_table("car")
+        expected = VisList([Vis(intent) for intent in intents], serial_df)
+
+        # the queries are dispatched concurrently, and their results are collected in order
+        lux.config.set_SQL_connection_factory(lambda: sqlite3.connect(path))
+        lux.config.num_workers = 4
+        lux.config.sql_batch_size = 1
+        sql_df = pd.DataFrame()
+        sql_df.set_SQL_table("car")
+        assert sql_df.unique_values == serial_df.unique_values
+        vislist = VisList([Vis(intent) for intent in intents], sql_df)
+        for vis, expected_vis in zip(vislist, expected):
+            assert vis.data.to_dict() == expected_vis.data.to_dict()
+    finally:
+        lux.config.num_workers = 1
+        lux.config.sql_batch_size = 50
+        lux.config.set_SQL_connection("")
+        lux.config.set_executor_type("Pandas")
+
+
+def test_sql_scatter_sample(sql_df, monkeypatch):
+    import lux.executor.SQLExecutor
+
+    monkeypatch.setattr(lux.executor.SQLExecutor, "SCATTER_SAMPLE_SIZE", 100)
+    statements = []
+    lux.config.SQLconnection.set_trace_callback(statements.append)
+    vis = Vis(["Horsepower", "Weight"], sql_df)
+    assert len(vis.data) == 100
+    vis = Vis(["Acceleration", "Weight"], sql_df)
+    assert len(vis.data) == 100
+    # the sample is queried once for both scatter plots
+    assert len([statement for statement in statements if "random()" in statement]) == 1
+
+    # the sample is queried again once the number of rows of the table changes
+    lux.config.SQLconnection.execute("DELETE FROM car WHERE Origin = 'Japan'")
+    vis = Vis(["Horsepower", "Weight"], sql_df)
+    assert len(vis.data) == 100
+    assert "Japan" not in set(sql_df._SQL_sample["data"]["Origin"])
+    assert len([statement for statement in statements if "random()" in statement]) == 2
+
+    # the modification marker is retrieved once for all the scatter plots computed together
+    statements.clear()
+    VisList([Vis(["Horsepower", "Weight"]), Vis(["Acceleration", "Weight"])], sql_df)
+    assert len([statement for statement in statements if "data_version" in statement]) == 1
+    lux.config.SQLconnection.set_trace_callback(None)
+
+
+def test_sql_catalog_stats(sql_df):
+    expected = sql_df.cardinality
+    connection = lux.config.SQLconnection
+    for attr in ["Cylinders", "Origin", "Horsepower", "Weight"]:
+        connection.execute(f'CREATE INDEX car_{attr} ON car ("{attr}")')
+    connection.execute("ANALYZE")
+
+    lux.config.sql_catalog_stats = True
+    statements = []
+    connection.set_trace_callback(statements.append)
+    sql_df.set_SQL_table("car")
+    connection.set_trace_callback(None)
+    lux.config.sql_catalog_stats = False
+    assert sql_df.cardinality == expected
+    assert sql_df.data_type["Cylinders"] == "nominal"
+    assert sql_df.data_type["Horsepower"] == "quantitative"
+
+    # only the columns without an estimate, or whose estimate is close to the nominal cutoff, are counted
+    stats = [statement for statement in statements if "MIN(" in statement]
+    assert len(stats) == 1
+    assert 'COUNT(DISTINCT "Name")' in stats[0]
+    assert 'COUNT(DISTINCT "Horsepower")' not in stats[0]
+    assert 'COUNT(DISTINCT "Weight")' not in stats[0]
+    assert 'COUNT(DISTINCT "Cylinders")' not in stats[0]
+
+
+def test_sql_with_pandas_df(sql_df):
+    # a dataframe read with pandas while a SQL table is explored is processed by pandas
+    car_df = pd.read_csv("lux/data/car.csv")
+    assert car_df.data_type["Origin"] == "nominal"
+    assert car_df.cardinality["Origin"] == 3
+    vis = Vis(["Origin", "Horsepower"], car_df)
+    result = dict(zip(vis.data["Origin"], vis.data["Horsepower"]))
+    assert result == pytest.approx(car_df.groupby("Origin")["Horsepower"].mean().to_dict())
+    car_df._repr_html_()
+    assert len(car_df.recommendation) > 0
+
+    # the SQL table is still processed by the SQL executor
+    assert lux.config.executor.name == "SQLExecutor"
+    vis = Vis(["Origin", "Horsepower"], sql_df)
+    assert dict(zip(vis.data["Origin"], vis.data["Horsepower"])) == pytest.approx(result)
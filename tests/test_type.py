@@ -284,6 +284,21 @@ def test_ID():
     }
 
 
+def test_id_evenly_spaced():
+    """Tests that the spacing of all values is checked, not only of the first ones"""
+    df = pd.DataFrame({"value": list(range(0, 6000, 4)) + [2] * 100})
+    df.maintain_metadata()
+    assert df.data_type["value"] == "quantitative"
+
+    df = pd.DataFrame({"value": list(range(0, 6000, 4)) + [6000] * 100})
+    df.maintain_metadata()
+    assert df.data_type["value"] == "quantitative"
+
+    df = pd.DataFrame({"value": list(range(0, 6400, 4))})
+    df.maintain_metadata()
+    assert df.data_type["value"] == "id"
+
+
 def test_id_aug_test():
     """Tests in a different dataset
     Reference: https://www.kaggle.com/arashnic/hr-analytics-job-change-of-data-scientists
@@ -366,3 +381,39 @@ def test_id_absenteeism_data():
         "Body mass index": "nominal",
         "Absenteeism time in hours": "nominal",
     }
+
+
+def test_check_datetime_string_sample():
+    dates = pd.date_range("2000-01-01", periods=500, freq="D")
+    df = pd.DataFrame(
+        {
+            "date": dates.strftime("%m/%d/%Y"),
+            "mixed": list(dates.strftime("%m/%d/%Y")[:-1]) + ["not a date"],
+            "text": [f"value {i}" for i in range(500)],
+        }
+    )
+    df.maintain_metadata()
+    assert df.data_type["date"] == "temporal"
+    # the values that can not be parsed may be left out of the sample, but not of the verification
+    assert df.data_type["mixed"] == "nominal"
+    assert df.data_type["text"] == "nominal"
+
+
+def test_check_datetime_string_truncated():
+    frequent_dates = list(pd.date_range("2000-01-01", periods=300, freq="D").strftime("%m/%d/%Y"))
+    users = [f"user_{i}" for i in range(12000)]
+    df = pd.DataFrame(
+        {
+            "mixed": frequent_dates * 93 + users[:100] + users,
+            "date": list(pd.date_range("1980-01-01", periods=12000, freq="D").strftime("%m/%d/%Y")) * 3
+            + frequent_dates * 13
+            + frequent_dates[:100],
+        }
+    )
+    df.maintain_metadata()
+    assert len(df) == 40000
+    # only the most frequent values are kept, which are all dates in both columns
+    assert len(df.unique_values["mixed"]) < df.cardinality["mixed"]
+    assert len(df.unique_values["date"]) < df.cardinality["date"]
+    assert df.data_type["mixed"] == "nominal"
+    assert df.data_type["date"] == "temporal"